@@ -1,77 +1,247 @@
-from flask import Flask, jsonify, render_template, request
+from concurrent.futures import Future, TimeoutError
+from datetime import date
+from typing import Any, Callable
 
-from src.radio import STATIONS, Radio
+import logging
+import time
+
+from flask import Flask, Response, g, jsonify, render_template, request
+
+from src import memory
+
+# Trace allocations from here on, so that they can be attributed to subsystems
+memory.start_tracing()
+
+from src import logs, metrics  # noqa: E402
+from src.alarms import WEEKDAYS  # noqa: E402
+from src.commands import SUPERSEDED  # noqa: E402
+from src.events import Snapshot  # noqa: E402
+from src.radio import STATIONS, Radio  # noqa: E402
+
+# Log records are written by a background thread
+logs.configure()
+log = logging.getLogger(__name__)
 
 app = Flask(__name__)
 
-# Initialize Radio instance
+# Initialize Radio instance; hardware and network come up in the background
 radio = Radio()
+radio.start()
+
+# Seconds a request waits for its command; loading a stream can take a while
+COMMAND_TIMEOUT = 40
+
+
+def wait_for(command: Future) -> Any:
+    """Wait for a radio command to finish and return its result; False if it failed or timed out."""
+    try:
+        return command.result(timeout=COMMAND_TIMEOUT)
+    except TimeoutError:
+        log.warning("Radio command timed out")
+        return False
+    except Exception:
+        log.exception("Radio command failed")
+        return False
+
+
+def playback_response(result: Any, success_message: str, error_message: str) -> Response:
+    if result is SUPERSEDED:
+        # A later play or stop request replaced this one before it ran
+        return jsonify({"status": "superseded", "message": "Overridden by a later request"})
+    return jsonify(
+        {
+            "status": "success" if result else "error",
+            "message": success_message if result else error_message,
+        },
+    )
+
+
+@app.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def record_latency(response):
+    if "request_start" in g:
+        metrics.histogram(
+            "ticki_http_request_seconds",
+            "Time to handle a web request",
+            slow=0.5,
+            endpoint=request.endpoint or "unknown",
+        ).observe(time.perf_counter() - g.request_start)
+    return response
+
+
+@app.route("/metrics")
+def prometheus_metrics():
+    return Response(metrics.REGISTRY.render(), mimetype="text/plain; version=0.0.4")
+
+
+@app.route("/metrics/slow")
+def slow_events():
+    return jsonify(list(metrics.REGISTRY.slow_events))
+
+
+@app.route("/metrics/memory")
+def memory_report():
+    return jsonify(memory.report())
+
+
+@app.route("/logs")
+def recent_logs():
+    """Recent log records, e.g. /logs?limit=50&level=WARNING."""
+    level = logging.getLevelName(request.args.get("level", "NOTSET").upper())
+    if not isinstance(level, int):
+        return jsonify({"status": "error", "message": "Unknown log level"}), 400
+    return jsonify(logs.recent(request.args.get("limit", 100, type=int), level))
+
+
+def conditional(etag: str, build: Callable[[], Response]) -> Response:
+    """Answer 304 Not Modified if the client already has the version tagged etag."""
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    else:
+        response = build()
+    response.set_etag(etag)
+    # Browsers may keep the page but must check that it is still current
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+# (ETag, HTML) of the last rendered page; the page only changes with the state
+_page: tuple[str, str] | None = None
+
+
+def render_home(snapshot: Snapshot) -> str:
+    global _page
+    page = _page
+    if page is None or page[0] != snapshot.etag:
+        state = snapshot.state
+        html = render_template(
+            "index.html",
+            STATIONS=STATIONS,
+            current_station=STATIONS[state["station"]].name,
+            alarms=state["alarms"],
+            weekdays=WEEKDAYS,
+            next_alarm=state["next_alarm"],
+            is_playing=state["playing"],
+        )
+        page = _page = (snapshot.etag, html)
+    return page[1]
 
 
 @app.route("/")
 def home():
-    return render_template(
-        "index.html",
-        STATIONS=STATIONS,
-        current_station=radio.current_station.name,
-        alarm_times=[alarm.to_dict() for alarm in radio.alarms],
-        next_alarm=radio.get_next_alarm(),
-        is_playing=radio.is_playing,
-    )
+    snapshot = radio.events.snapshot
+    return conditional(snapshot.etag, lambda: Response(render_home(snapshot), mimetype="text/html"))
 
 
-@app.route("/play", methods=["POST"])
-def play():
-    success = radio.play_radio()
+@app.route("/state")
+def state():
+    snapshot = radio.events.snapshot
+    return conditional(snapshot.etag, lambda: Response(snapshot.body, mimetype="application/json"))
+
+
+@app.route("/status")
+def status():
     return jsonify(
         {
-            "status": "success" if success else "error",
-            "message": "Radio is playing" if success else "Failed to play radio",
+            "ready": radio.is_ready(),
+            "subsystems": radio.readiness,
+            "startup_timings": radio.startup_timings,
+            "stream_health": radio.get_stream_health(),
         },
     )
 
 
+@app.route("/events")
+def events():
+    subscription = radio.events.subscribe()
+    if subscription is None:
+        return jsonify({"status": "error", "message": "Too many clients"}), 503
+
+    return Response(
+        radio.events.stream(subscription),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
+
+
+@app.route("/play", methods=["POST"])
+def play():
+    return playback_response(
+        wait_for(radio.play_radio()), "Radio is playing", "Failed to play radio"
+    )
+
+
 @app.route("/stop", methods=["POST"])
 def stop():
-    success = radio.stop_radio()
-    return jsonify(
-        {
-            "status": "success" if success else "error",
-            "message": "Radio stopped" if success else "Failed to stop radio",
-        },
-    )
+    return playback_response(wait_for(radio.stop_radio()), "Radio stopped", "Failed to stop radio")
 
 
 @app.route("/set_alarm", methods=["POST"])
 def set_alarm():
-    alarm_time = request.form.get("time")
-    assert isinstance(alarm_time, str)
-
+    alarm_time = request.form.get("time") or None
     enabled = request.form.get("enabled") == "true"
-    alarm_index = int(request.form.get("alarm_index", 0))
+    alarm_id = int(request.form.get("alarm_id", 0))
+    # Comma-separated weekdays (0 = Monday) and an optional date for one-off alarms
+    days = frozenset(int(day) for day in request.form.get("days", "").split(",") if day)
+    on = request.form.get("date")
 
     try:
-        success = radio.set_alarm(alarm_time, enabled, alarm_index)
+        on = date.fromisoformat(on) if on else None
+        success = radio.set_alarm(alarm_time, enabled, alarm_id, days, on).result(COMMAND_TIMEOUT)
         next_alarm = radio.get_next_alarm()
         return jsonify(
             {
                 "status": "success" if success else "error",
-                "message": f'Alarm {alarm_index + 1} {"enabled" if enabled else "disabled"} for {alarm_time}',
+                "message": f'Alarm {"enabled" if enabled else "disabled"} for {alarm_time}',
                 "next_alarm": next_alarm if next_alarm else "No alarm set",
             },
         )
     except Exception as e:
-        print(f"Failed to set alarm: {e!s}")
+        log.warning("Failed to set alarm: %s", e)
         return jsonify({"status": "error", "message": f"Failed to set alarm: {e!s}"})
 
 
+@app.route("/add_alarm", methods=["POST"])
+def add_alarm():
+    alarm_id = wait_for(radio.add_alarm())
+    if alarm_id is False:
+        return jsonify({"status": "error", "message": "Failed to add alarm"})
+    return jsonify({"status": "success", "alarm_id": alarm_id})
+
+
+@app.route("/delete_alarm", methods=["POST"])
+def delete_alarm():
+    success = wait_for(radio.delete_alarm(int(request.form.get("alarm_id", 0))))
+    return jsonify(
+        {
+            "status": "success" if success else "error",
+            "message": "Alarm deleted" if success else "No such alarm",
+        },
+    )
+
+
+@app.route("/skip_alarm", methods=["POST"])
+def skip_alarm():
+    success = wait_for(radio.skip_alarm(int(request.form.get("alarm_id", 0))))
+    return jsonify(
+        {
+            "status": "success" if success else "error",
+            "message": "Next alarm skipped" if success else "Alarm is not set",
+        },
+    )
+
+
 @app.route("/set_station", methods=["POST"])
 def set_station():
     data = request.get_json()
     station_name = data.get("station")
     assert isinstance(station_name, str)
 
-    if radio.set_station(station_name):
+    if wait_for(radio.set_station(station_name)):
         return jsonify(
             {"status": "success", "station_name": STATIONS[station_name].name},
         )
@@ -0,0 +1,55 @@
+"""
+Compare per-frame OLED render time of luma's canvas with the cached text renderer.
+
+Run from the repository root:
+
+    python -m benchmarks.display
+"""
+
+from datetime import datetime
+import json
+import time
+
+from luma.core.device import dummy
+from luma.core.render import canvas
+
+from src.display import Display
+
+FRAMES = 600
+
+
+def render_with_canvas(device, minute: int):
+    with canvas(device) as draw:
+        draw.text((0, 0), f"7:{minute:02d}", fill="white", font_size=22)
+        draw.text((0, 24), "Alarm: 06:45", fill="white", font_size=16)
+        draw.text((0, 40), "3.2°C to 11°C", fill="white", font_size=16)
+
+
+def main():
+    device = dummy(width=128, height=64, mode="1")
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        render_with_canvas(device, frame % 60)
+    canvas_time = (time.perf_counter() - start) / FRAMES
+
+    display = Display(dummy(width=128, height=64, mode="1"))
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        display.update_time(datetime(2024, 1, 1, 7, frame % 60), "06:45")
+    cached_time = (time.perf_counter() - start) / FRAMES
+
+    print(
+        json.dumps(
+            {
+                "canvas_ms_per_frame": canvas_time * 1000,
+                "cached_ms_per_frame": cached_time * 1000,
+                "cache_hits": display.text_cache.hits,
+                "cache_misses": display.text_cache.misses,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Measure the overhead of metrics instrumentation on the projector's hot path.
+
+Run from the repository root:
+
+    python -m benchmarks.metrics
+"""
+
+import json
+import time
+
+from src.metrics import Registry
+from src.projector import Projector
+from src.transport import BitbangTransport
+
+
+def per_call(fn, iterations: int = 20_000) -> float:
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(i)
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    histogram = Registry().histogram("ticki_benchmark_seconds", "Benchmark")
+
+    def timed(_):
+        with histogram.time():
+            pass
+
+    projector = Projector(BitbangTransport())
+    projector.startup.cancel()
+    projector.startup.wait()
+    # Every call writes a frame: the time changes each iteration
+    send_time = per_call(lambda i: projector.send_time(i // 60 % 24, i % 60), iterations=200)
+    timer = per_call(timed)
+    empty = per_call(lambda _: None)
+
+    print(
+        json.dumps(
+            {
+                "timer_overhead_us": (timer - empty) * 1_000_000,
+                "send_time_us": send_time * 1_000_000,
+                # send_time is instrumented twice (send_time and the frame write)
+                "overhead_percent": 2 * (timer - empty) / send_time * 100,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
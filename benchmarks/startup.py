@@ -0,0 +1,47 @@
+"""
+Measure how quickly the web UI comes up, using mock hardware.
+
+Run from the repository root:
+
+    python -m benchmarks.startup
+"""
+
+import json
+import os
+import time
+
+
+def main():
+    os.environ.setdefault("TICKI_PROJECTOR_TRANSPORT", "recording")
+    os.environ.setdefault("TICKI_DISPLAY", "dummy")
+
+    start = time.perf_counter()
+    from app import app, radio
+
+    imported = time.perf_counter()
+    response = app.test_client().get("/status")
+    first_response = time.perf_counter()
+    assert response.status_code == 200
+
+    # Wait for the background initialization to settle (failures count as settled)
+    for name in radio.readiness:
+        radio._ready[name].wait(timeout=60)
+    settled = time.perf_counter()
+
+    print(
+        json.dumps(
+            {
+                "import_app": imported - start,
+                "first_response": first_response - start,
+                "all_subsystems": settled - start,
+                "subsystems": radio.readiness,
+                "startup_timings": radio.startup_timings,
+            },
+            indent=2,
+        )
+    )
+    radio.cleanup()
+
+
+if __name__ == "__main__":
+    main()
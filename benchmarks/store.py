@@ -0,0 +1,72 @@
+"""
+Measure restore time and write amplification of the state store under rapid alarm edits.
+
+Run from the repository root:
+
+    python -m benchmarks.store
+"""
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import json
+import time
+
+from src.store import StateStore
+
+ALARMS = 20
+BURSTS = 100
+EDITS_PER_BURST = 10
+
+
+def alarm(edit: int) -> dict:
+    return {"time": f"{edit // 60 % 24:02d}:{edit % 60:02d}", "enabled": True, "days": [0, 1, 2]}
+
+
+def main():
+    with TemporaryDirectory() as tmp:
+        path = Path(tmp) / "state.log"
+        store = StateStore(path, flush_delay=60)
+        store.load()
+        state = {}
+        naive_bytes = payload_bytes = 0
+
+        for burst in range(BURSTS):
+            # A user scrolling through the time picker
+            for edit in range(EDITS_PER_BURST):
+                key = f"alarm/{burst % ALARMS}"
+                value = alarm(burst * EDITS_PER_BURST + edit)
+                store.set(key, value)
+                state[key] = value
+                payload_bytes += len(json.dumps(value))
+                # Rewriting the whole state as JSON on every change
+                naive_bytes += len(json.dumps(state))
+            store.flush()
+        store.close()
+
+        start = time.perf_counter()
+        restored = StateStore(path).load()
+        restore_time = time.perf_counter() - start
+        assert restored == state
+
+        edits = BURSTS * EDITS_PER_BURST
+        print(
+            json.dumps(
+                {
+                    "edits": edits,
+                    "restore_ms": restore_time * 1000,
+                    "log_bytes": path.stat().st_size,
+                    "bytes_written": store.stats["bytes"],
+                    "write_amplification": store.stats["bytes"] / payload_bytes,
+                    "fsyncs": store.stats["fsyncs"],
+                    "compactions": store.stats["compactions"],
+                    "naive_bytes_written": naive_bytes,
+                    "naive_write_amplification": naive_bytes / payload_bytes,
+                    "naive_fsyncs": edits,
+                },
+                indent=2,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Micro-benchmarks of the encode → transmit → render pipeline, using mock hardware.
+
+Run from the repository root:
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline results.json
+
+With --baseline, every benchmark that got slower than the baseline by more than
+--threshold (relative) is reported as a regression and the exit status is 1.
+"""
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Callable
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+os.environ.setdefault("TICKI_PROJECTOR_TRANSPORT", "recording")
+os.environ.setdefault("TICKI_DISPLAY", "dummy")
+
+from luma.core.device import dummy  # noqa: E402
+
+from src.animation import compile_capture, load_timeline  # noqa: E402
+from src.display import Display  # noqa: E402
+from src.mock_hardware import PinRecorder  # noqa: E402
+from src.projector import FRAME_BITS, Projector, pack_frame  # noqa: E402
+from src.radio import Radio  # noqa: E402
+from src.store import StateStore  # noqa: E402
+from src.transport import RecordingTransport  # noqa: E402
+
+STARTUP_CSV = Path(__file__).parents[1] / "src" / "startup.csv"
+
+# Each benchmark is a setup function returning the operation to time and a cleanup
+Setup = Callable[[], tuple[Callable[[int], object], Callable[[], None]]]
+BENCHMARKS: dict[str, Setup] = {}
+
+
+def benchmark(name: str):
+    def register(setup: Setup) -> Setup:
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+def _projector() -> tuple[Projector, RecordingTransport]:
+    transport = RecordingTransport()
+    projector = Projector(transport)
+    projector.startup.cancel()
+    projector.startup.wait()
+    return projector, transport
+
+
+@benchmark("create_clock_event")
+def _create_clock_event():
+    projector, _ = _projector()
+    return lambda i: projector.create_clock_event(i // 60 % 24, i % 60), projector.close
+
+
+@benchmark("pack_frame")
+def _pack_frame():
+    projector, _ = _projector()
+    events = [projector.create_clock_event(i // 60, i % 60) for i in range(24 * 60)]
+    return lambda i: pack_frame(events[i % len(events)]), projector.close
+
+
+@benchmark("send_time")
+def _send_time():
+    projector, transport = _projector()
+
+    def send(i: int):
+        projector.send_time(i // 60 % 24, i % 60)
+        transport.frames.clear()
+
+    return send, projector.close
+
+
+@benchmark("bitbang_write")
+def _bitbang_write():
+    # The per-bit loop of BitbangTransport, driving recorded mock pins
+    recorder = PinRecorder()
+    transport = recorder.transport()
+    frame = pack_frame(Projector.create_clock_event(12, 34))
+
+    def write(_: int):
+        transport.write_frame(frame, FRAME_BITS)
+        recorder.samples.clear()
+
+    return write, transport.close
+
+
+@benchmark("compile_capture")
+def _compile_capture():
+    return lambda _: compile_capture(STARTUP_CSV), lambda: None
+
+
+@benchmark("load_timeline_cached")
+def _load_timeline_cached():
+    tmp = TemporaryDirectory()
+    cache_dir = Path(tmp.name)
+    load_timeline(STARTUP_CSV, cache_dir)
+    return lambda _: load_timeline(STARTUP_CSV, cache_dir), tmp.cleanup
+
+
+@benchmark("display_render")
+def _display_render():
+    display = Display(dummy(width=128, height=64, mode="1"))
+    start = datetime(2024, 1, 1, 7, 0)
+
+    def render(i: int):
+        display.update_time(start + timedelta(minutes=i % 60), "06:45")
+
+    return render, display.wait_idle
+
+
+@benchmark("get_next_alarm")
+def _get_next_alarm():
+    tmp = TemporaryDirectory()
+    radio = Radio(store=StateStore(Path(tmp.name) / "state.log"))
+    for hour in range(8):
+        alarm_id = radio.add_alarm().result()
+        radio.set_alarm(f"{hour + 6:02d}:30", True, alarm_id, frozenset({0, 2, 4})).result()
+
+    def cleanup():
+        radio.cleanup()
+        tmp.cleanup()
+
+    return lambda _: radio.get_next_alarm(), cleanup
+
+
+def measure(setup: Setup, repeats: int = 5, min_time: float = 0.05) -> dict[str, float]:
+    """Time an operation: calibrate the number of calls per run, then repeat the runs."""
+    operation, cleanup = setup()
+    try:
+        number = 1
+        while True:
+            start = time.perf_counter()
+            for i in range(number):
+                operation(i)
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+            number *= 2
+
+        runs = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for i in range(number):
+                operation(i)
+            runs.append((time.perf_counter() - start) / number)
+    finally:
+        cleanup()
+
+    return {
+        "median_us": statistics.median(runs) * 1_000_000,
+        "min_us": min(runs) * 1_000_000,
+        "calls_per_run": number,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Describe every benchmark whose median got slower than the baseline by more than threshold."""
+    regressions = []
+    for name, result in results["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        change = result["median_us"] / before["median_us"] - 1
+        if change > threshold:
+            regressions.append(
+                f"{name}: {before['median_us']:.2f} us -> {result['median_us']:.2f} us "
+                f"(+{change:.0%})"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", type=Path, help="write the results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="compare against saved results")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="allowed slowdown (0.2 = 20%%)"
+    )
+    parser.add_argument("--only", nargs="*", help="run only these benchmarks")
+    args = parser.parse_args(argv)
+
+    results = {
+        "meta": {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "results": {},
+    }
+    for name, setup in BENCHMARKS.items():
+        if args.only and name not in args.only:
+            continue
+        results["results"][name] = measure(setup)
+        print(f"{name:24} {results['results'][name]['median_us']:10.2f} us", file=sys.stderr)
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text()), args.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
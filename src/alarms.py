@@ -0,0 +1,158 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+import heapq
+import threading
+
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+# Days searched for the next occurrence: a weekly alarm whose next occurrence is skipped
+# rings again two weeks later at the latest
+_SEARCH_DAYS = 15
+
+
+def parse_time(value: str) -> time:
+    hours, minutes = value.split(":")
+    return time(int(hours), int(minutes))
+
+
+@dataclass(slots=True)
+class Alarm:
+    """An alarm at a time of day
+
+    It rings every day unless `days` restricts it to some weekdays (0 = Monday)
+    or `on` makes it a one-off alarm on that date. The occurrence in `skipped`
+    is left out.
+    """
+
+    time: str | None = None
+    enabled: bool = False
+    days: frozenset[int] = frozenset()
+    on: date | None = None
+    skipped: datetime | None = None
+    time_of_day: time | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.time_of_day = parse_time(self.time) if self.time else None
+
+    def next_occurrence(self, after: datetime) -> datetime | None:
+        """The first time after `after` at which the alarm rings, if any."""
+        if not self.enabled or self.time_of_day is None:
+            return None
+
+        if self.on is not None:
+            at = datetime.combine(self.on, self.time_of_day)
+            return at if at > after and at != self.skipped else None
+
+        day = after.date()
+        for _ in range(_SEARCH_DAYS):
+            at = datetime.combine(day, self.time_of_day)
+            if at > after and at != self.skipped and (not self.days or day.weekday() in self.days):
+                return at
+            day += timedelta(days=1)
+        return None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> Alarm:
+        return cls(
+            data["time"],
+            data["enabled"],
+            frozenset(data.get("days", ())),
+            date.fromisoformat(data["date"]) if data.get("date") else None,
+            datetime.fromisoformat(data["skipped"]) if data.get("skipped") else None,
+        )
+
+    def to_dict(self):
+        return {
+            "time": self.time,
+            "enabled": self.enabled,
+            "days": sorted(self.days),
+            "date": self.on.isoformat() if self.on else None,
+            "skipped": self.skipped.isoformat(timespec="minutes") if self.skipped else None,
+        }
+
+
+class AlarmSchedule:
+    """Alarms indexed by their next fire time
+
+    A heap holds one (fire time, alarm id, revision) entry per ringing alarm.
+    Changing an alarm bumps its revision instead of searching the heap; outdated
+    entries are dropped once they reach the top. Peeking at the next alarm is
+    O(1) unless an alarm changed or passed, which costs O(log n).
+    """
+
+    def __init__(self):
+        self.alarms: dict[int, Alarm] = {}
+        self._heap: list[tuple[datetime, int, int]] = []
+        self._revisions: dict[int, int] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.alarms)
+
+    def items(self) -> list[tuple[int, Alarm]]:
+        with self._lock:
+            return list(self.alarms.items())
+
+    def add(self, alarm: Alarm, now: datetime, alarm_id: int | None = None) -> int:
+        """Add an alarm, under a new id unless one is given (e.g. when restoring)."""
+        with self._lock:
+            if alarm_id is None:
+                alarm_id = self._next_id
+            self._next_id = max(self._next_id, alarm_id + 1)
+            self.alarms[alarm_id] = alarm
+            self._index(alarm_id, now)
+            return alarm_id
+
+    def update(self, alarm_id: int, alarm: Alarm, now: datetime):
+        with self._lock:
+            if alarm_id not in self.alarms:
+                raise KeyError(f"No alarm {alarm_id}")
+            self.alarms[alarm_id] = alarm
+            self._index(alarm_id, now)
+
+    def remove(self, alarm_id: int):
+        with self._lock:
+            del self.alarms[alarm_id]
+            # Its heap entry is dropped lazily
+            self._revisions.pop(alarm_id, None)
+
+    def skip_next(self, alarm_id: int, now: datetime) -> datetime | None:
+        """Leave out the next occurrence of an alarm; returns the skipped time."""
+        with self._lock:
+            alarm = self.alarms[alarm_id]
+            alarm.skipped = None
+            alarm.skipped = alarm.next_occurrence(now)
+            self._index(alarm_id, now)
+            return alarm.skipped
+
+    def next(self, now: datetime) -> tuple[datetime, int] | None:
+        """The next fire time after `now` and the id of the alarm."""
+        with self._lock:
+            while self._heap:
+                at, alarm_id, revision = self._heap[0]
+                if revision != self._revisions.get(alarm_id):
+                    heapq.heappop(self._heap)
+                elif at <= now:
+                    # Passed: queue the following occurrence
+                    self._index(alarm_id, now)
+                else:
+                    return at, alarm_id
+            return None
+
+    def _index(self, alarm_id: int, now: datetime):
+        revision = self._revisions.get(alarm_id, 0) + 1
+        self._revisions[alarm_id] = revision
+        at = self.alarms[alarm_id].next_occurrence(now)
+        if at is not None:
+            heapq.heappush(self._heap, (at, alarm_id, revision))
+
+
+def describe(at: datetime, now: datetime) -> str:
+    """Format an alarm time as HH:MM, prefixed with the weekday or date if it is a day away."""
+    if at - now < timedelta(days=1):
+        return at.strftime("%H:%M")
+    if at - now < timedelta(days=7):
+        return f"{WEEKDAYS[at.weekday()]} {at:%H:%M}"
+    return f"{at:%d.%m.} {at:%H:%M}"
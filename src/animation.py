@@ -0,0 +1,204 @@
+from __future__ import annotations
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+import csv
+import logging
+import queue
+import struct
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+CACHE_DIR = Path.home() / ".cache" / "ticki" / "animations"
+
+# Header of a compiled timeline: magic, source mtime (ns), source size, number of steps
+_HEADER = struct.Struct("<4sqqI")
+_MAGIC = b"TKA1"
+
+# Pin state bits
+MOSI = 1
+CLK = 2
+EN = 4
+
+
+@dataclass
+class Timeline:
+    """Compiled pin capture: one packed MOSI/CLK/EN state per step and the delay before it"""
+
+    delays_us: array  # array("I"): microseconds since the previous step
+    states: bytes  # MOSI | CLK << 1 | EN << 2
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def to_bytes(self, source_mtime_ns: int = 0, source_size: int = 0) -> bytes:
+        header = _HEADER.pack(_MAGIC, source_mtime_ns, source_size, len(self))
+        return header + self.delays_us.tobytes() + self.states
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> tuple[Timeline, int, int]:
+        """Parse a compiled timeline, also returning the source mtime and size it was built from."""
+        magic, mtime_ns, size, count = _HEADER.unpack_from(data)
+        if magic != _MAGIC:
+            raise ValueError("Not a compiled animation")
+
+        delays_us = array("I")
+        offset = _HEADER.size
+        delays_us.frombytes(data[offset : offset + count * delays_us.itemsize])
+        offset += count * delays_us.itemsize
+        states = data[offset : offset + count]
+        if len(delays_us) != count or len(states) != count:
+            raise ValueError("Truncated compiled animation")
+        return cls(delays_us, states), mtime_ns, size
+
+
+def compile_capture(csv_path: Path) -> Timeline:
+    """Compile a logic analyzer capture with columns Time [s],MOSI,CLK,EN."""
+    delays_us = array("I")
+    states = bytearray()
+    with open(csv_path, "r") as f:
+        reader = csv.reader(f)
+        next(reader)  # Skip header
+        last_time = None
+        for row in reader:
+            if not row:
+                continue
+            current_time = float(row[0])
+            if last_time is None:
+                last_time = current_time
+            delays_us.append(round((current_time - last_time) * 1_000_000))
+            states.append(int(row[1]) * MOSI | int(row[2]) * CLK | int(row[3]) * EN)
+            last_time = current_time
+    return Timeline(delays_us, bytes(states))
+
+
+def load_timeline(csv_path: Path, cache_dir: Path = CACHE_DIR) -> Timeline:
+    """Load a capture, compiling it only if the cached compiled form is missing or outdated."""
+    csv_path = Path(csv_path)
+    stat = csv_path.stat()
+    cache_path = cache_dir / f"{csv_path.stem}.tka"
+    try:
+        timeline, mtime_ns, size = Timeline.from_bytes(cache_path.read_bytes())
+        if (mtime_ns, size) == (stat.st_mtime_ns, stat.st_size):
+            return timeline
+    except (OSError, ValueError, struct.error):
+        pass
+
+    timeline = compile_capture(csv_path)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        tmp_path.write_bytes(timeline.to_bytes(stat.st_mtime_ns, stat.st_size))
+        tmp_path.replace(cache_path)
+    except OSError as e:
+        log.warning("Failed to cache compiled animation: %s", e)
+    return timeline
+
+
+@dataclass
+class Playback:
+    """A queued or running animation"""
+
+    timeline: Timeline
+    cancelled: threading.Event = field(default_factory=threading.Event)
+    done: threading.Event = field(default_factory=threading.Event)
+    # Absolute error of each step against the capture timing, in microseconds
+    errors_us: list[float] = field(default_factory=list)
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self.done.wait(timeout)
+
+    def timing_error(self) -> dict[str, float]:
+        """Mean and max deviation (µs) of the played steps from the original capture."""
+        if not self.errors_us:
+            return {"mean_us": 0.0, "max_us": 0.0}
+        return {
+            "mean_us": sum(self.errors_us) / len(self.errors_us),
+            "max_us": max(self.errors_us),
+        }
+
+
+class AnimationPlayer:
+    """Plays queued timelines one after another on a dedicated thread
+
+    Each step is scheduled against an absolute deadline from the start of the
+    animation, so sleep overshoot does not accumulate over the timeline. The lock
+    is held for the whole animation so frames cannot interleave with it.
+    """
+
+    def __init__(
+        self,
+        set_pins: Callable[[bool, bool, bool], None],
+        lock: threading.Lock,
+        on_finished: Callable[[], None] | None = None,
+    ):
+        self.set_pins = set_pins
+        self.lock = lock
+        self.on_finished = on_finished
+        self._queue: queue.Queue[Playback | None] = queue.Queue()
+        self._current: Playback | None = None
+        self._thread = threading.Thread(target=self._run, name="animation", daemon=True)
+        self._thread.start()
+
+    def play(self, timeline: Timeline) -> Playback:
+        """Queue a timeline; returns immediately with a handle to cancel or wait for it."""
+        playback = Playback(timeline)
+        self._queue.put(playback)
+        return playback
+
+    def stop(self, timeout: float | None = 5):
+        """Cancel queued and running animations and end the thread."""
+        while True:
+            try:
+                playback = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if playback is not None:
+                playback.cancel()
+                playback.done.set()
+        if self._current is not None:
+            self._current.cancel()
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def _run(self):
+        while (playback := self._queue.get()) is not None:
+            self._current = playback
+            try:
+                if not playback.cancelled.is_set():
+                    with self.lock:
+                        self._play(playback)
+                        if self.on_finished:
+                            self.on_finished()
+            except Exception:
+                log.exception("Error playing animation")
+            finally:
+                self._current = None
+                playback.done.set()
+
+    def _play(self, playback: Playback):
+        timeline = playback.timeline
+        start = time.perf_counter()
+        offset_us = 0
+        for delay_us, state in zip(timeline.delays_us, timeline.states):
+            if playback.cancelled.is_set():
+                return
+            offset_us += delay_us
+            due = start + offset_us / 1_000_000
+            # Long pauses end early when the animation is cancelled; the last
+            # 10 ms are slept precisely
+            if due - time.perf_counter() > 0.01 and playback.cancelled.wait(
+                due - time.perf_counter() - 0.01
+            ):
+                return
+            remaining = due - time.perf_counter()
+            if remaining > 0:
+                time.sleep(remaining)
+            self.set_pins(bool(state & MOSI), bool(state & CLK), bool(state & EN))
+            playback.errors_us.append(abs((time.perf_counter() - start) * 1_000_000 - offset_us))
@@ -0,0 +1,27 @@
+_UNSET = object()
+
+
+class ChangeTracker:
+    """Remembers the last content pushed to a device so unchanged writes can be skipped"""
+
+    def __init__(self):
+        self._last = _UNSET
+        self.performed = 0
+        self.skipped = 0
+
+    def changed(self, content) -> bool:
+        """Return True (and remember content) if it differs from the last write."""
+        if content == self._last:
+            self.skipped += 1
+            return False
+
+        self._last = content
+        self.performed += 1
+        return True
+
+    def invalidate(self):
+        """Forget the last write, e.g. after the device state was changed behind our back."""
+        self._last = _UNSET
+
+    def to_dict(self) -> dict[str, int]:
+        return {"performed": self.performed, "skipped": self.skipped}
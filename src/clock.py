@@ -0,0 +1,117 @@
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Callable
+import logging
+import threading
+import time
+from . import metrics
+
+log = logging.getLogger(__name__)
+
+TICK_LAG = metrics.histogram(
+    "ticki_clock_tick_lag_seconds", "Delay of minute ticks after the boundary", slow=1.0
+)
+CLOCK_JUMPS = metrics.counter("ticki_clock_jumps_total", "Wall-clock jumps (NTP, DST)")
+
+
+class MinuteClock:
+    """Calls on_tick at every wall-clock minute boundary from a dedicated thread
+
+    The thread sleeps until the next boundary instead of polling every second.
+    Sleeps are capped at max_sleep seconds so that wall-clock jumps (NTP sync,
+    DST changes) are noticed and displayed within that time.
+    """
+
+    def __init__(
+        self,
+        on_tick: Callable[[datetime], None],
+        max_sleep: float = 15.0,
+        jump_threshold: float = 2.0,
+    ):
+        self.on_tick = on_tick
+        self.max_sleep = max_sleep
+        self.jump_threshold = jump_threshold
+        self.subminute_interval: float | None = None
+
+        self.ticks = 0
+        self.clock_jumps = 0
+        self.lags: deque[float] = deque(maxlen=60)
+
+        self._last_minute: datetime | None = None
+        self._last_wall: datetime | None = None
+        self._last_mono: float | None = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="minute-clock", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join()
+
+    def set_subminute_interval(self, seconds: float | None):
+        """Also tick every `seconds` (e.g. while something is animated), or None to stop."""
+        self.subminute_interval = seconds
+        self._wake.set()
+
+    def lag_stats(self) -> dict[str, float | int]:
+        """How late (in seconds) the recent minute ticks fired after their boundary."""
+        return {
+            "ticks": self.ticks,
+            "clock_jumps": self.clock_jumps,
+            "last_lag": self.lags[-1] if self.lags else 0.0,
+            "max_lag": max(self.lags, default=0.0),
+            "mean_lag": sum(self.lags) / len(self.lags) if self.lags else 0.0,
+        }
+
+    @staticmethod
+    def seconds_until_next_minute(now: datetime) -> float:
+        next_minute = now.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        return (next_minute - now).total_seconds()
+
+    def _run(self):
+        while not self._stop.is_set():
+            sleep = self._step(datetime.now(), time.monotonic())
+            self._wake.wait(sleep)
+            self._wake.clear()
+
+    def _step(self, now: datetime, mono: float) -> float:
+        """Fire a tick if one is due at `now` and return how long to sleep afterwards."""
+        jumped = False
+        if self._last_wall is not None and self._last_mono is not None:
+            expected = self._last_wall + timedelta(seconds=mono - self._last_mono)
+            if abs((now - expected).total_seconds()) > self.jump_threshold:
+                jumped = True
+                self.clock_jumps += 1
+                CLOCK_JUMPS.inc()
+        self._last_wall = now
+        self._last_mono = mono
+
+        minute = now.replace(second=0, microsecond=0)
+        if minute != self._last_minute:
+            # Lag is only meaningful for regular boundary ticks, not the first tick or jumps
+            if self._last_minute is not None and not jumped:
+                self.lags.append((now - minute).total_seconds())
+                TICK_LAG.observe(self.lags[-1])
+            self._last_minute = minute
+            self._fire(now)
+        elif self.subminute_interval:
+            self._fire(now)
+
+        sleep = min(self.seconds_until_next_minute(now), self.max_sleep)
+        if self.subminute_interval:
+            sleep = min(sleep, self.subminute_interval)
+        return sleep
+
+    def _fire(self, now: datetime):
+        self.ticks += 1
+        try:
+            self.on_tick(now)
+        except Exception:
+            log.exception("Error in clock tick")
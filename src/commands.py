@@ -0,0 +1,110 @@
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable
+import threading
+import time
+
+
+class Superseded:
+    """Result of a command that was replaced by a different one before it ran"""
+
+    def __repr__(self) -> str:
+        return "SUPERSEDED"
+
+    def __bool__(self) -> bool:
+        return False
+
+
+SUPERSEDED = Superseded()
+
+
+@dataclass(slots=True)
+class _Command:
+    fn: Callable[..., Any]
+    args: tuple
+    key: Hashable | None
+    due: float
+    futures: list[Future] = field(default_factory=list)
+
+
+class CommandExecutor:
+    """Runs commands one at a time on a dedicated thread
+
+    Commands submitted with a coalescing key wait `coalesce_window` seconds
+    before running. A command submitted with the same key while an earlier one
+    is still waiting replaces it in the queue. If both call the same function,
+    all callers receive the result of the command that actually ran; callers of
+    a replaced different function (e.g. play replaced by stop) get SUPERSEDED.
+    The window is not extended by replacements, and commands always run in the
+    order they were first queued.
+    """
+
+    def __init__(self, coalesce_window: float = 0.3, clock: Callable[[], float] = time.monotonic):
+        self.coalesce_window = coalesce_window
+        self.clock = clock
+        self.executed = 0
+        self.coalesced = 0
+        self._queue: deque[_Command] = deque()
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="commands", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable[..., Any], *args, key: Hashable | None = None) -> Future:
+        future: Future = Future()
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("Executor is stopped")
+
+            if key is not None:
+                for command in self._queue:
+                    if command.key == key:
+                        if command.fn != fn:
+                            for replaced in command.futures:
+                                replaced.set_result(SUPERSEDED)
+                            command.futures.clear()
+                        command.fn, command.args = fn, args
+                        command.futures.append(future)
+                        self.coalesced += 1
+                        return future
+
+            due = self.clock() + (self.coalesce_window if key is not None else 0)
+            self._queue.append(_Command(fn, args, key, due, [future]))
+            self._condition.notify_all()
+        return future
+
+    def stop(self, timeout: float | None = None):
+        """Run the queued commands and stop the thread."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+
+    def _next(self) -> _Command | None:
+        with self._condition:
+            while True:
+                if not self._queue:
+                    if self._stopped:
+                        return None
+                    self._condition.wait()
+                    continue
+
+                wait = self._queue[0].due - self.clock()
+                if wait > 0 and not self._stopped:
+                    # Woken early if the head command is replaced or the executor stops
+                    self._condition.wait(wait)
+                    continue
+                return self._queue.popleft()
+
+    def _run(self):
+        while (command := self._next()) is not None:
+            try:
+                result = command.fn(*command.args)
+            except Exception as e:
+                for future in command.futures:
+                    future.set_exception(e)
+            else:
+                for future in command.futures:
+                    future.set_result(result)
+            self.executed += 1
@@ -0,0 +1,199 @@
+"""
+Decode projector pin captures back into frames and clock times, and measure their timing.
+
+A capture is a series of samples of the MOSI, CLK and EN lines, e.g. exported from a
+logic analyzer (columns Time [s],MOSI,CLK,EN) or recorded from Projector through a
+PinRecorder. Bits are sampled on rising CLK edges while EN is low; every stretch of
+EN low is one frame.
+
+Run from the repository root to analyze a capture:
+
+    python -m src.decoder src/startup.csv
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+import json
+import sys
+import numpy as np
+from .projector import FRAME_BITS
+from .seven_segment_utils import DIGIT_TO_SEGMENTS, HOUR_ONES, MINUTE_ONES, MINUTE_TENS, Digit
+from .mock_hardware import PinRecorder
+
+# Lit segments → digit, for each digit position
+_DIGITS = {frozenset(segments): digit for digit, segments in DIGIT_TO_SEGMENTS.items()}
+
+
+@dataclass
+class Capture:
+    """Samples of the three lines; each sample is the state from its time on"""
+
+    times: np.ndarray  # seconds
+    mosi: np.ndarray
+    clk: np.ndarray
+    en: np.ndarray
+
+    @classmethod
+    def from_csv(cls, path: str | Path) -> "Capture":
+        data = np.loadtxt(path, delimiter=",", skiprows=1, ndmin=2)
+        return cls(data[:, 0], *(data[:, column].astype(np.int8) for column in (1, 2, 3)))
+
+    @classmethod
+    def from_recorder(cls, recorder: PinRecorder) -> "Capture":
+        samples = np.array(recorder.samples, dtype=np.int64).reshape(-1, 4)
+        return cls(
+            (samples[:, 0] - samples[0, 0]) / 1e9 if len(samples) else np.zeros(0),
+            *(samples[:, column].astype(np.int8) for column in (1, 2, 3)),
+        )
+
+
+@dataclass
+class Frame:
+    start: float  # time of the first bit (s)
+    end: float  # time of the last bit (s)
+    bits: int  # number of bits
+    value: int  # bits, first bit most significant
+
+    @property
+    def clock_time(self) -> tuple[int, int] | None:
+        """The (hours, minutes) shown by a clock frame, or None for other frames."""
+        if self.bits != FRAME_BITS or not self.value >> (FRAME_BITS - 1):
+            return None
+        return decode_time((self.value & ((1 << 40) - 1)).to_bytes(5, "big"))
+
+
+@dataclass
+class TimingReport:
+    frames: int
+    bit_rate: float  # mean bits per second within frames
+    min_bit_rate: float
+    min_setup: float  # shortest time MOSI was stable before a rising CLK edge (s)
+    min_hold: float  # shortest time MOSI stayed stable after a rising CLK edge (s)
+    min_gap: float  # shortest time between the end of one frame and the start of the next (s)
+    mean_gap: float
+
+    def violations(self, min_setup: float, min_hold: float, min_gap: float) -> list[str]:
+        """Describe where the capture falls short of the given timing requirements."""
+        checks = (
+            ("setup", self.min_setup, min_setup),
+            ("hold", self.min_hold, min_hold),
+            ("gap", self.min_gap, min_gap),
+        )
+        return [
+            f"{name} {actual * 1e6:.1f} us < {required * 1e6:.1f} us"
+            for name, actual, required in checks
+            if actual < required
+        ]
+
+
+def _digit(event: bytes, digit: Digit) -> int | None:
+    lit = frozenset(
+        segment for segment, loc in digit.segments.items() if event[loc.byte] >> loc.bit & 1
+    )
+    return _DIGITS.get(lit)
+
+
+def decode_time(event: bytes) -> tuple[int, int] | None:
+    """Map a 5-byte clock event back to (hours, minutes); None if the segments form no time."""
+    if event[4] & 1 << 7:
+        hour_tens = 1 if event[4] & 1 << 6 else 2 if event[4] & 1 << 1 else None
+    else:
+        hour_tens = 0
+    digits = (_digit(event, HOUR_ONES), _digit(event, MINUTE_TENS), _digit(event, MINUTE_ONES))
+    if hour_tens is None or None in digits:
+        return None
+    hour_ones, minute_tens, minute_ones = digits
+    return hour_tens * 10 + hour_ones, minute_tens * 10 + minute_ones
+
+
+def _rising_edges(capture: Capture) -> np.ndarray:
+    """Indices of the samples where CLK rises while EN is low."""
+    clk = capture.clk
+    edges = np.flatnonzero((clk[1:] == 1) & (clk[:-1] == 0)) + 1
+    return edges[capture.en[edges] == 0]
+
+
+def _frame_ids(capture: Capture, edges: np.ndarray) -> np.ndarray:
+    """Number of the EN-low stretch each edge belongs to."""
+    en_falls = np.flatnonzero((capture.en[1:] == 0) & (capture.en[:-1] == 1)) + 1
+    return np.searchsorted(en_falls, edges, side="right")
+
+
+def decode(capture: Capture) -> list[Frame]:
+    edges = _rising_edges(capture)
+    if not len(edges):
+        return []
+
+    bits = capture.mosi[edges].astype(np.uint8)
+    ids = _frame_ids(capture, edges)
+    boundaries = np.flatnonzero(np.diff(ids)) + 1
+    frames = []
+    for frame_edges, frame_bits in zip(np.split(edges, boundaries), np.split(bits, boundaries)):
+        # packbits pads the last byte with zeros on the right
+        padding = -len(frame_bits) % 8
+        value = int.from_bytes(np.packbits(frame_bits).tobytes(), "big") >> padding
+        frames.append(
+            Frame(
+                float(capture.times[frame_edges[0]]),
+                float(capture.times[frame_edges[-1]]),
+                len(frame_bits),
+                value,
+            )
+        )
+    return frames
+
+
+def analyze(capture: Capture) -> TimingReport:
+    """Measure bit rate, setup/hold margins and gaps between frames."""
+    times = capture.times
+    edges = _rising_edges(capture)
+    if not len(edges):
+        return TimingReport(0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+    # Setup: since the last MOSI change at or before the edge; hold: until the next one
+    changes = np.flatnonzero(np.diff(capture.mosi)) + 1
+    before = np.searchsorted(changes, edges, side="right") - 1
+    after = before + 1
+    setup = np.where(before >= 0, times[edges] - times[changes[np.maximum(before, 0)]], np.inf)
+    has_next = after < len(changes)
+    hold = np.where(
+        has_next, times[changes[np.minimum(after, len(changes) - 1)]] - times[edges], np.inf
+    )
+
+    frames = decode(capture)
+    rates = np.array(
+        [
+            (frame.bits - 1) / (frame.end - frame.start)
+            for frame in frames
+            if frame.end > frame.start
+        ]
+    )
+    gaps = np.array([later.start - earlier.end for earlier, later in zip(frames, frames[1:])])
+    return TimingReport(
+        frames=len(frames),
+        bit_rate=float(rates.mean()) if len(rates) else 0.0,
+        min_bit_rate=float(rates.min()) if len(rates) else 0.0,
+        min_setup=float(setup.min()),
+        min_hold=float(hold.min()),
+        min_gap=float(gaps.min()) if len(gaps) else 0.0,
+        mean_gap=float(gaps.mean()) if len(gaps) else 0.0,
+    )
+
+
+def main(path: str):
+    capture = Capture.from_csv(path)
+    report = analyze(capture)
+    frames = [
+        {
+            "start": frame.start,
+            "bits": frame.bits,
+            "value": hex(frame.value),
+            "time": frame.clock_time,
+        }
+        for frame in decode(capture)
+    ]
+    print(json.dumps({"timing": report.__dict__, "frames": frames}, indent=2))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
@@ -1,10 +1,60 @@
-from luma.core.interface.serial import i2c
-from luma.oled.device import ssd1306
-from luma.core.render import canvas
+from PIL import Image, ImageDraw, ImageFont
+from collections import OrderedDict
 from datetime import datetime
+import os
+import sys
+import threading
+from .change_tracker import ChangeTracker
+from . import metrics
+from .oled import DisplayWorker, PageFlusher
 from .weather import Weather
 
 
+# (x, y, font size) of the time, alarm and weather lines
+LAYOUT = ((0, 0, 22), (0, 24, 16), (0, 40, 16))
+
+RENDER = metrics.histogram(
+    "ticki_display_render_seconds", "Time to compose a display frame", slow=0.02
+)
+
+
+class TextCache:
+    """LRU cache of rasterized 1-bit text runs, with each font size loaded once"""
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._fonts: dict[int, ImageFont.ImageFont] = {}
+        self._bitmaps: OrderedDict[tuple[str, int], Image.Image] = OrderedDict()
+        # Used to measure text the same way (1-bit, no anti-aliasing) it is drawn
+        self._measure = ImageDraw.Draw(Image.new("1", (1, 1)))
+
+    def font(self, size: int):
+        if size not in self._fonts:
+            self._fonts[size] = ImageFont.load_default(size)
+        return self._fonts[size]
+
+    def get(self, text: str, size: int) -> Image.Image:
+        """The text drawn at (0, 0) as a mode "1" bitmap, rendered on first use."""
+        key = (text, size)
+        bitmap = self._bitmaps.get(key)
+        if bitmap is not None:
+            self.hits += 1
+            self._bitmaps.move_to_end(key)
+            return bitmap
+
+        self.misses += 1
+        font = self.font(size)
+        _, _, right, bottom = self._measure.textbbox((0, 0), text, font=font)
+        bitmap = Image.new("1", (max(right, 1), max(bottom, 1)))
+        ImageDraw.Draw(bitmap).text((0, 0), text, fill="white", font=font)
+        self._bitmaps[key] = bitmap
+        if len(self._bitmaps) > self.maxsize:
+            self._bitmaps.popitem(last=False)
+        return bitmap
+
+
 class Display:
     """Handles the 128x128 OLED display output
 
@@ -15,20 +65,47 @@ class Display:
     - GND -> Ground (Physical pin 6)
     """
 
-    def __init__(self):
-        """Initialize the display."""
-        serial = i2c(port=1, address=0x3C)
-        self.device = ssd1306(serial)
+    def __init__(self, device=None):
+        """Initialize the display on the given (or configured) luma device."""
+        self.device = device or create_device()
         self.time_text = "0:00"
         self.alarm_text = "No alarm set"
         self.weather_text = "Weather n/a"
+        self.tracker = ChangeTracker()
+        self.text_cache = TextCache()
+        self.framebuffer = Image.new(self.device.mode, self.device.size)
+        # Only the SSD1306 supports partial updates; other devices get full frames.
+        # luma.oled is only imported when such a device was created.
+        oled = sys.modules.get("luma.oled.device")
+        is_ssd1306 = oled is not None and isinstance(self.device, oled.ssd1306)
+        self.flusher = PageFlusher(self.device) if is_ssd1306 else None
+        self.worker = DisplayWorker(self.flusher.flush if self.flusher else self.device.display)
+        # The clock and weather threads both update the screen
+        self._lock = threading.Lock()
         self._render()
 
     def _render(self):
-        with canvas(self.device) as draw:
-            draw.text((0, 0), self.time_text, fill="white", font_size=22, align="justified")
-            draw.text((0, 24), self.alarm_text, fill="white", font_size=16, align="justified")
-            draw.text((0, 40), self.weather_text, fill="white", font_size=16, align="justified")
+        """Redraw the screen if any of the texts changed since the last render."""
+        with self._lock, RENDER.time():
+            texts = (self.time_text, self.alarm_text, self.weather_text)
+            if not self.tracker.changed(texts):
+                return
+
+            try:
+                self.framebuffer.paste(0, (0, 0, *self.framebuffer.size))
+                for text, (x, y, size) in zip(texts, LAYOUT):
+                    bitmap = self.text_cache.get(text, size)
+                    # Use the bitmap as a mask so overlapping runs combine like draw.text does
+                    self.framebuffer.paste(255, (x, y, x + bitmap.width, y + bitmap.height), bitmap)
+                # The worker sends it to the device; the framebuffer is reused for the next frame
+                self.worker.submit(self.framebuffer.copy())
+            except Exception:
+                self.tracker.invalidate()
+                raise
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Wait until the last rendered frame has reached the device."""
+        return self.worker.wait_idle(timeout)
 
     def update_time(
         self,
@@ -39,9 +116,28 @@ class Display:
         self.alarm_text = f"Alarm: {next_alarm}" if next_alarm else "No alarm set"
         self._render()
 
+    def update_alarm(self, next_alarm: str | None = None):
+        self.alarm_text = f"Alarm: {next_alarm}" if next_alarm else "No alarm set"
+        self._render()
+
     def update_weather(
         self,
         weather: Weather | None = None,
     ):
         self.weather_text = weather.print() if weather else "Weather n/a"
         self._render()
+
+
+def create_device(name: str | None = None):
+    """Create the luma device named by name or $TICKI_DISPLAY (ssd1306 or dummy)."""
+    name = name or os.environ.get("TICKI_DISPLAY", "ssd1306")
+    if name == "ssd1306":
+        from luma.core.interface.serial import i2c
+        from luma.oled.device import ssd1306
+
+        return ssd1306(i2c(port=1, address=0x3C))
+    if name == "dummy":
+        from luma.core.device import dummy
+
+        return dummy(width=128, height=64, mode="1")
+    raise ValueError(f"Unknown display: {name}")
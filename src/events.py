@@ -0,0 +1,116 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Iterator, Mapping
+import json
+import os
+import queue
+import threading
+import time
+
+
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    """The state at one version, serialized once for all clients that ask for it"""
+
+    version: int
+    state: Mapping[str, Any]
+    body: bytes  # {"version": ..., **state} as JSON
+    etag: str  # Unique across restarts, since versions start over
+
+
+class Subscription:
+    """One connected client's queue of (event id, delta) pairs"""
+
+    def __init__(self, maxsize: int):
+        self.queue: queue.Queue[tuple[int, dict[str, Any]]] = queue.Queue(maxsize)
+        self.overflowed = False
+
+
+class StateBroadcaster:
+    """Pushes changes of the radio state to all connected clients
+
+    publish() is given the full state and only forwards the keys that changed.
+    A client that falls too far behind is sent the full state again.
+
+    Every change bumps `version` and replaces `snapshot`, so readers get a
+    consistent, already serialized state without taking the lock.
+    """
+
+    def __init__(self, max_clients: int = 8, queue_size: int = 32):
+        self.max_clients = max_clients
+        self.queue_size = queue_size
+        self.version = 0
+        self._state: dict[str, Any] = {}
+        self._subscribers: list[Subscription] = []
+        self._lock = threading.Lock()
+        self._epoch = os.urandom(4).hex()
+        self.snapshot = self._snapshot()
+
+    def _snapshot(self) -> Snapshot:
+        state = dict(self._state)
+        return Snapshot(
+            self.version,
+            MappingProxyType(state),
+            json.dumps({"version": self.version, **state}).encode(),
+            f"{self._epoch}-{self.version}",
+        )
+
+    def publish(self, state: dict[str, Any]):
+        with self._lock:
+            delta = {key: value for key, value in state.items() if self._state.get(key) != value}
+            if not delta:
+                return
+            self._state = dict(state)
+            self.version += 1
+            self.snapshot = self._snapshot()
+            for subscription in self._subscribers:
+                try:
+                    subscription.queue.put_nowait((self.version, delta))
+                except queue.Full:
+                    subscription.overflowed = True
+
+    def subscribe(self) -> Subscription | None:
+        """Register a client, or return None if too many are connected."""
+        with self._lock:
+            if len(self._subscribers) >= self.max_clients:
+                return None
+            subscription = Subscription(self.queue_size)
+            # Every client starts with the full state
+            subscription.queue.put_nowait((self.version, dict(self._state)))
+            self._subscribers.append(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def stream(
+        self, subscription: Subscription, heartbeat: float = 15, duration: float = 120
+    ) -> Iterator[str]:
+        """
+        Yield Server-Sent Events for a subscription.
+
+        The stream ends after `duration` seconds; browsers reconnect automatically,
+        which keeps a forgotten tab from holding a server thread forever.
+        """
+        deadline = time.monotonic() + duration
+        try:
+            while (remaining := deadline - time.monotonic()) > 0:
+                if subscription.overflowed:
+                    # Skip the backlog and resend the full state instead
+                    with self._lock:
+                        subscription.overflowed = False
+                        while not subscription.queue.empty():
+                            subscription.queue.get_nowait()
+                        event = (self.version, dict(self._state))
+                else:
+                    try:
+                        event = subscription.queue.get(timeout=min(heartbeat, remaining))
+                    except queue.Empty:
+                        yield ": ping\n\n"
+                        continue
+                version, delta = event
+                yield f"id: {version}\ndata: {json.dumps(delta)}\n\n"
+        finally:
+            self.unsubscribe(subscription)
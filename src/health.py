@@ -0,0 +1,161 @@
+from typing import Callable
+import logging
+import random
+import threading
+import time
+from . import metrics
+
+log = logging.getLogger(__name__)
+
+# Seconds a reconnected stream may take to buffer before the attempt counts as failed
+RECOVERY_TIMEOUT = 10.0
+
+STALLS = metrics.counter("ticki_stream_stalls_total", "Buffer underruns while playing")
+DROPS = metrics.counter("ticki_stream_drops_total", "Streams that ended or failed while playing")
+FAILED_RECONNECTS = metrics.counter(
+    "ticki_stream_failed_reconnects_total", "Reconnect attempts that did not bring audio back"
+)
+UNDERRUN = metrics.histogram(
+    "ticki_stream_underrun_seconds", "Duration of buffer underruns while playing", slow=5.0
+)
+RECONNECT = metrics.histogram(
+    "ticki_stream_reconnect_seconds",
+    "Time from a dropped stream until it buffered again",
+    slow=10.0,
+)
+
+
+class StreamMonitor:
+    """Watches the playing stream through player events and reconnects when it drops
+
+    Nothing is polled: the player reports buffering, end of stream and errors.
+    Those arrive on VLC's event thread, so they only update the stats and wake
+    the monitor thread. It calls reconnect(attempt) right away and then with
+    jittered exponential backoff until the stream has buffered again. The
+    monitor only acts while armed, i.e. while the radio is supposed to be playing.
+    """
+
+    def __init__(
+        self,
+        reconnect: Callable[[int], bool],
+        min_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        recovery_timeout: float = RECOVERY_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.reconnect = reconnect
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.recovery_timeout = recovery_timeout
+        self.clock = clock
+        self.stats = {
+            "stalls": 0,
+            "drops": 0,
+            "reconnects": 0,
+            "failed_reconnects": 0,
+            "underrun_seconds": 0.0,
+            "last_reconnect_seconds": None,
+        }
+        self._armed = False
+        # Buffering before the stream first filled is the start, not a stall
+        self._filled = False
+        self._underrun_started: float | None = None
+        self._dropped_at: float | None = None
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="stream-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join()
+
+    def arm(self):
+        """The stream is supposed to be playing from now on."""
+        with self._lock:
+            self._armed = True
+            self._filled = False
+            self._dropped_at = None
+            self._underrun_started = None
+
+    def disarm(self):
+        with self._lock:
+            self._armed = False
+            self._filled = False
+            self._dropped_at = None
+            self._underrun_started = None
+
+    def on_player_event(self, kind: str, cache: float = 0.0):
+        """Player listener for "buffering" (with the cache fill in %), "end" and "error"."""
+        with self._lock:
+            if not self._armed:
+                return
+            now = self.clock()
+            if kind == "buffering" and cache < 100.0:
+                if self._filled and self._underrun_started is None and self._dropped_at is None:
+                    self._underrun_started = now
+                    self.stats["stalls"] += 1
+                    STALLS.inc()
+            elif kind == "buffering":
+                self._filled = True
+                self._end_underrun(now)
+                if self._dropped_at is not None:
+                    latency = now - self._dropped_at
+                    self._dropped_at = None
+                    self.stats["reconnects"] += 1
+                    self.stats["last_reconnect_seconds"] = latency
+                    RECONNECT.observe(latency)
+                    self._wake.set()
+            elif kind in ("end", "error"):
+                self._end_underrun(now)
+                if self._dropped_at is None:
+                    self._dropped_at = now
+                    self.stats["drops"] += 1
+                    DROPS.inc()
+                self._wake.set()
+
+    def _end_underrun(self, now: float):
+        if self._underrun_started is not None:
+            duration = now - self._underrun_started
+            self._underrun_started = None
+            self.stats["underrun_seconds"] += duration
+            UNDERRUN.observe(duration)
+
+    def _dropped(self) -> bool:
+        with self._lock:
+            return self._armed and self._dropped_at is not None
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter, so that retries don't synchronize."""
+        return random.uniform(0, min(self.min_backoff * 2 ** (attempt - 1), self.max_backoff))
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait()
+            self._wake.clear()
+            attempt = 0
+            while self._dropped() and not self._stop.is_set():
+                if attempt:
+                    self._stop.wait(self._backoff(attempt))
+                    if not self._dropped():
+                        break
+                self._wake.clear()
+                try:
+                    reconnecting = self.reconnect(attempt)
+                except Exception:
+                    log.exception("Error reconnecting stream")
+                    reconnecting = False
+                attempt += 1
+                # Woken by the stream buffering again or by it failing once more
+                if reconnecting and self._wake.wait(self.recovery_timeout):
+                    if not self._dropped():
+                        break
+                self.stats["failed_reconnects"] += 1
+                FAILED_RECONNECTS.inc()
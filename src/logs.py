@@ -0,0 +1,197 @@
+"""
+Logging that stays off the latency path of requests and ticks.
+
+Modules log through the standard `logging` module. configure() routes every record
+into an in-process queue; a background thread formats the records, drops repetitive
+ones, writes them to stderr in batches and keeps the most recent ones in memory.
+
+Levels come from $TICKI_LOG_LEVEL (default INFO) and per logger from
+$TICKI_LOG_LEVELS, e.g. "src.clock=WARNING,src.streams=DEBUG".
+"""
+
+from collections import deque
+from logging.handlers import QueueHandler
+from typing import TextIO
+import atexit
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+
+FORMAT = "%(levelname)s %(name)s: %(message)s"
+
+# Records written per batch at most, and seconds a record may wait for more
+BATCH_SIZE = 64
+BATCH_DELAY = 0.5
+
+# Records with the same logger and message template allowed per period
+RATE_LIMIT_BURST = 5
+RATE_LIMIT_PERIOD = 60.0
+
+
+def parse_levels(spec: str) -> dict[str, str]:
+    """Parse "logger=LEVEL,..." into a dict; entries without a logger apply to the root."""
+    levels = {}
+    for entry in spec.split(","):
+        name, _, level = entry.strip().rpartition("=")
+        if level:
+            levels[name] = level.upper()
+    return levels
+
+
+class RateLimiter:
+    """Lets through `burst` records per period for each logger and message template
+
+    The first record after a suppressed stretch notes how many were dropped.
+    """
+
+    def __init__(
+        self,
+        burst: int = RATE_LIMIT_BURST,
+        period: float = RATE_LIMIT_PERIOD,
+        clock=time.monotonic,
+    ):
+        self.burst = burst
+        self.period = period
+        self.clock = clock
+        self.suppressed = 0
+        # (logger, template) → [window start, records in window, suppressed in window]
+        self._windows: dict[tuple[str, str], list] = {}
+
+    def allow(self, record: logging.LogRecord) -> bool:
+        key = (record.name, getattr(record, "template", str(record.msg)))
+        now = self.clock()
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= self.period:
+            dropped = window[2] if window else 0
+            self._windows[key] = [now, 1, 0]
+            if dropped:
+                record.msg = f"{record.msg} ({dropped} similar messages suppressed)"
+            if len(self._windows) > 1024:
+                self._expire(now)
+            return True
+        if window[1] < self.burst:
+            window[1] += 1
+            return True
+        window[2] += 1
+        self.suppressed += 1
+        return False
+
+    def _expire(self, now: float):
+        for key, window in list(self._windows.items()):
+            if now - window[0] >= self.period and not window[2]:
+                del self._windows[key]
+
+
+class _QueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The message is rendered now since its arguments may change; the template
+        # is kept for rate limiting
+        template = str(record.msg)
+        record = super().prepare(record)
+        record.template = template
+        return record
+
+
+class LogPipeline:
+    """Takes records from a queue and writes them in batches on a background thread"""
+
+    def __init__(
+        self,
+        stream: TextIO | None = None,
+        capacity: int = 500,
+        batch_size: int = BATCH_SIZE,
+        batch_delay: float = BATCH_DELAY,
+        limiter: RateLimiter | None = None,
+    ):
+        self.stream = stream
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.limiter = limiter or RateLimiter()
+        self.formatter = logging.Formatter(FORMAT)
+        # Logging threads only put records into this queue; SimpleQueue.put doesn't block
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.handler = _QueueHandler(self.queue)
+        self.recent: deque[dict] = deque(maxlen=capacity)
+        self.writes = 0
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Write what is queued and end the writer thread."""
+        if self._thread:
+            self.queue.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def records(self, limit: int = 100, level: int = logging.NOTSET) -> list[dict]:
+        """The most recent records at or above level, oldest first."""
+        matching = [record for record in list(self.recent) if record["levelno"] >= level]
+        return matching[-limit:]
+
+    def _run(self):
+        running = True
+        while running:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.batch_delay
+            while batch[-1] is not None and len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                running = False
+                batch.pop()
+            self._write(batch)
+
+    def _write(self, batch: list[logging.LogRecord]):
+        lines = []
+        for record in batch:
+            if not self.limiter.allow(record):
+                continue
+            line = self.formatter.format(record)
+            lines.append(line)
+            self.recent.append(
+                {
+                    "time": record.created,
+                    "level": record.levelname,
+                    "levelno": record.levelno,
+                    "logger": record.name,
+                    "message": record.getMessage(),
+                }
+            )
+        if lines:
+            stream = self.stream or sys.stderr
+            stream.write("\n".join(lines) + "\n")
+            stream.flush()
+            self.writes += 1
+
+
+_pipeline: LogPipeline | None = None
+
+
+def configure(level: str | None = None, levels: str | None = None) -> LogPipeline:
+    """Send all logging through the background pipeline; safe to call more than once."""
+    global _pipeline
+    root = logging.getLogger()
+    root.setLevel(level or os.environ.get("TICKI_LOG_LEVEL", "INFO").upper())
+    overrides = parse_levels(levels or os.environ.get("TICKI_LOG_LEVELS", ""))
+    for name, logger_level in overrides.items():
+        logging.getLogger(name or None).setLevel(logger_level)
+
+    if _pipeline is None:
+        _pipeline = LogPipeline()
+        _pipeline.start()
+        root.addHandler(_pipeline.handler)
+        atexit.register(_pipeline.stop)
+    return _pipeline
+
+
+def recent(limit: int = 100, level: int = logging.NOTSET) -> list[dict]:
+    """Recent records of the configured pipeline."""
+    return _pipeline.records(limit, level) if _pipeline else []
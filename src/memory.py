@@ -0,0 +1,70 @@
+"""
+Memory use of the running process: resident set size and, while tracemalloc is tracing,
+the Python allocations of each subsystem.
+
+Tracing costs memory and CPU, so it is only started when $TICKI_TRACEMALLOC is set
+(or Python runs with -X tracemalloc).
+"""
+
+from collections import Counter
+from pathlib import Path
+import os
+import sys
+import sysconfig
+import tracemalloc
+
+SRC_DIR = Path(__file__).resolve().parent
+STDLIB_DIR = Path(sysconfig.get_paths()["stdlib"]).resolve()
+
+
+def start_tracing(frames: int = 1):
+    """Start tracing allocations if $TICKI_TRACEMALLOC asks for it."""
+    if os.environ.get("TICKI_TRACEMALLOC") and not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+
+
+def rss_bytes() -> int:
+    """Current resident set size; the peak where the current value isn't available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def subsystem(filename: str) -> str:
+    """The module (e.g. "display") or top-level package (e.g. "PIL") a file belongs to."""
+    path = Path(filename)
+    if path.parent == SRC_DIR:
+        return path.stem
+    parts = path.parts
+    for marker in ("site-packages", "dist-packages"):
+        if marker in parts:
+            package = parts[parts.index(marker) + 1]
+            return package.removesuffix(".py")
+    if filename.startswith("<") or path.is_relative_to(STDLIB_DIR):
+        return "<python>"
+    return path.stem
+
+
+def allocations(snapshot: tracemalloc.Snapshot) -> Counter:
+    """Bytes allocated per subsystem in a snapshot."""
+    sizes = Counter()
+    for stat in snapshot.statistics("filename"):
+        sizes[subsystem(stat.traceback[0].filename)] += stat.size
+    return sizes
+
+
+def report(limit: int = 15) -> dict:
+    """RSS and, if tracing, traced bytes overall and for the largest subsystems."""
+    result = {"rss_bytes": rss_bytes(), "tracing": tracemalloc.is_tracing()}
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        result["traced_bytes"] = current
+        result["traced_peak_bytes"] = peak
+        result["subsystems"] = dict(allocations(tracemalloc.take_snapshot()).most_common(limit))
+    return result
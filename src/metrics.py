@@ -0,0 +1,157 @@
+from bisect import bisect_left
+from collections import deque
+from typing import Callable
+import threading
+import time
+
+# Upper bounds (seconds) of the latency histogram buckets
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Recent observations slower than their histogram's threshold
+SLOW_EVENTS = 100
+
+
+def _format_labels(labels: tuple[tuple[str, str], ...], extra: str = "") -> str:
+    parts = [f'{key}="{value}"' for key, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    def __init__(self, name: str, labels: tuple[tuple[str, str], ...] = ()):
+        self.name = name
+        self.labels = labels
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1):
+        with self._lock:
+            self.value += amount
+
+    def render(self) -> list[str]:
+        return [f"{self.name}{_format_labels(self.labels)} {self.value}"]
+
+
+class _Timer:
+    __slots__ = ("histogram", "start")
+
+    def __init__(self, histogram: "Histogram"):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start)
+
+
+class Histogram:
+    """Cumulative latency histogram with fixed buckets
+
+    Observations above `slow` seconds are also recorded in the registry's ring
+    buffer of slow events.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        labels: tuple[tuple[str, str], ...] = (),
+        buckets: tuple[float, ...] = BUCKETS,
+        slow: float | None = None,
+        on_slow: Callable[[str, tuple, float], None] | None = None,
+    ):
+        self.name = name
+        self.labels = labels
+        self.buckets = buckets
+        self.slow = slow
+        self.on_slow = on_slow
+        # One count per bucket plus one for +Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += seconds
+            self.count += 1
+        if self.slow is not None and seconds > self.slow and self.on_slow:
+            self.on_slow(self.name, self.labels, seconds)
+
+    def time(self) -> _Timer:
+        """Context manager observing the duration of its block."""
+        return _Timer(self)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip((*self.buckets, "+Inf"), counts):
+            cumulative += bucket_count
+            bucket_labels = _format_labels(self.labels, f'le="{bound}"')
+            lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+        lines.append(f"{self.name}_sum{_format_labels(self.labels)} {total}")
+        lines.append(f"{self.name}_count{_format_labels(self.labels)} {count}")
+        return lines
+
+
+class Registry:
+    """All metrics of the process, rendered in the Prometheus text format"""
+
+    def __init__(self, slow_events: int = SLOW_EVENTS):
+        self.slow_events: deque[dict] = deque(maxlen=slow_events)
+        self._metrics: dict[tuple[str, tuple], Counter | Histogram] = {}
+        self._help: dict[str, tuple[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str, **labels: str) -> Counter:
+        return self._get(name, help, "counter", labels, lambda key: Counter(name, key))
+
+    def histogram(
+        self, name: str, help: str, slow: float | None = None, **labels: str
+    ) -> Histogram:
+        return self._get(
+            name,
+            help,
+            "histogram",
+            labels,
+            lambda key: Histogram(name, key, slow=slow, on_slow=self._record_slow),
+        )
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.items(), key=lambda item: item[0])
+        lines = []
+        last_name = None
+        for (name, _), metric in metrics:
+            if name != last_name:
+                help, kind = self._help[name]
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                last_name = name
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def _get(self, name: str, help: str, kind: str, labels: dict[str, str], create):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            metric = self._metrics.get((name, key))
+            if metric is None:
+                metric = self._metrics[(name, key)] = create(key)
+                self._help[name] = (help, kind)
+            return metric
+
+    def _record_slow(self, name: str, labels: tuple, seconds: float):
+        self.slow_events.append(
+            {"time": time.time(), "metric": name, "labels": dict(labels), "seconds": seconds}
+        )
+
+
+REGISTRY = Registry()
+counter = REGISTRY.counter
+histogram = REGISTRY.histogram
@@ -0,0 +1,79 @@
+"""
+Stand-ins for the Raspberry Pi pin libraries, for development machines and tests.
+
+The module can be used in place of digitalio; `board` stands in for the board module.
+"""
+
+import time
+
+
+class DigitalInOut:
+    """Mock implementation of digitalio.DigitalInOut"""
+
+    __slots__ = ("value", "direction")
+
+    def __init__(self, pin):
+        self.value = False
+        self.direction = None
+
+
+class Direction:
+    """Mock implementation of digitalio.Direction"""
+
+    OUTPUT = "output"
+    INPUT = "input"
+
+
+class Board:
+    """Mock implementation of board pins"""
+
+    SCK = "SCK"
+    MOSI = "MOSI"
+    CE0 = "CE0"
+
+
+board = Board()
+
+
+class _RecordedPin:
+    __slots__ = ("recorder", "index", "direction")
+
+    def __init__(self, recorder: "PinRecorder", index: int):
+        self.recorder = recorder
+        self.index = index
+        self.direction = None
+
+    @property
+    def value(self) -> bool:
+        return bool(self.recorder.state[self.index])
+
+    @value.setter
+    def value(self, value: bool):
+        self.recorder.set(self.index, value)
+
+
+class PinRecorder:
+    """Mock pin layer that timestamps every change of the MOSI, CLK and EN lines
+
+    Pass its pins to BitbangTransport to capture exactly what the projector code
+    emits; src.decoder can then decode and time the recording.
+    """
+
+    def __init__(self):
+        # Lines start idle high
+        self.state = [1, 1, 1]  # MOSI, CLK, EN
+        # (perf_counter_ns, MOSI, CLK, EN) after each change
+        self.samples: list[tuple[int, int, int, int]] = []
+        self.mosi = _RecordedPin(self, 0)
+        self.sck = _RecordedPin(self, 1)
+        self.enable = _RecordedPin(self, 2)
+
+    def set(self, index: int, value: bool):
+        self.state[index] = int(value)
+        self.samples.append((time.perf_counter_ns(), *self.state))
+
+    def transport(self):
+        """A BitbangTransport driving the recorded pins."""
+        from .transport import BitbangTransport
+
+        return BitbangTransport(sck=self.sck, mosi=self.mosi, enable=self.enable)
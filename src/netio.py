@@ -0,0 +1,111 @@
+from __future__ import annotations
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Coroutine, TypeVar
+import asyncio
+import threading
+
+# Seconds before any outbound request is given up
+DEFAULT_TIMEOUT = 10.0
+
+T = TypeVar("T")
+
+
+class IOLoop:
+    """A long-lived asyncio event loop running on its own thread
+
+    Synchronous code (Flask handlers, scheduler jobs) submits coroutines with run()
+    instead of creating and tearing down an event loop for every fetch.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="io-loop", daemon=True)
+        self._thread.start()
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float = DEFAULT_TIMEOUT) -> T:
+        """Run coro on the loop and wait for its result, cancelling it after timeout."""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise TimeoutError(f"I/O operation timed out after {timeout}s")
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+_lock = threading.Lock()
+_io_loop: IOLoop | None = None
+_http_session = None
+_aiohttp_session = None
+
+
+def get_io_loop() -> IOLoop:
+    """The process-wide I/O loop, started on first use."""
+    global _io_loop
+    with _lock:
+        if _io_loop is None:
+            _io_loop = IOLoop()
+        return _io_loop
+
+
+def run_coroutine(coro: Coroutine[Any, Any, T], timeout: float = DEFAULT_TIMEOUT) -> T:
+    return get_io_loop().run(coro, timeout)
+
+
+def http_session():
+    """The process-wide requests.Session, keeping connections alive between requests."""
+    global _http_session
+    with _lock:
+        if _http_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            _http_session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=1)
+            _http_session.mount("http://", adapter)
+            _http_session.mount("https://", adapter)
+        return _http_session
+
+
+def http_get(url: str, timeout: float = DEFAULT_TIMEOUT, **kwargs):
+    """GET url on the shared session; raises requests.RequestException on failure."""
+    response = http_session().get(url, timeout=timeout, **kwargs)
+    response.raise_for_status()
+    return response
+
+
+async def aiohttp_session():
+    """The shared aiohttp session for coroutines running on the I/O loop."""
+    global _aiohttp_session
+    if _aiohttp_session is None or _aiohttp_session.closed:
+        import aiohttp
+
+        _aiohttp_session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT)
+        )
+    return _aiohttp_session
+
+
+async def _close_aiohttp_session():
+    global _aiohttp_session
+    if _aiohttp_session is not None and not _aiohttp_session.closed:
+        await _aiohttp_session.close()
+    _aiohttp_session = None
+
+
+def close():
+    """Close the shared sessions and stop the I/O loop (they are recreated on next use)."""
+    global _io_loop, _http_session
+    with _lock:
+        io_loop, _io_loop = _io_loop, None
+        session, _http_session = _http_session, None
+
+    if session is not None:
+        session.close()
+    if io_loop is not None:
+        io_loop.run(_close_aiohttp_session())
+        io_loop.close()
@@ -0,0 +1,146 @@
+from typing import Callable
+import logging
+import threading
+from PIL import Image
+from . import metrics
+
+log = logging.getLogger(__name__)
+
+# SSD1306 addressing commands
+COLUMNADDR = 0x21
+PAGEADDR = 0x22
+
+FLUSH = metrics.histogram(
+    "ticki_display_flush_seconds", "Time to send a frame to the display", slow=0.1
+)
+DROPPED_FRAMES = metrics.counter(
+    "ticki_display_dropped_frames_total", "Frames replaced by a newer one before being sent"
+)
+
+# Maps each byte to the byte with its bits in reverse order
+_REVERSED_BITS = bytes(int(f"{i:08b}"[::-1], 2) for i in range(256))
+
+
+def to_pages(image: Image.Image) -> bytes:
+    """
+    Convert a 1-bit image to SSD1306 GDDRAM layout.
+
+    The result holds height // 8 pages of `width` bytes each; every byte is one
+    column of 8 pixels with the top pixel in the least significant bit.
+    """
+    width, height = image.size
+    pages = height // 8
+    # After transposing, every row of the image is one column, packed MSB (= top) first
+    columns = image.transpose(Image.Transpose.TRANSPOSE).tobytes().translate(_REVERSED_BITS)
+    return b"".join(columns[page::pages] for page in range(pages))
+
+
+def dirty_ranges(old: bytes | None, new: bytes, width: int) -> list[tuple[int, int, int]]:
+    """The (page, first column, last column) ranges that differ between two page buffers."""
+    pages = len(new) // width
+    if old is None:
+        return [(page, 0, width - 1) for page in range(pages)]
+
+    ranges = []
+    for page in range(pages):
+        start = page * width
+        old_page = old[start : start + width]
+        new_page = new[start : start + width]
+        if old_page == new_page:
+            continue
+
+        first = 0
+        while old_page[first] == new_page[first]:
+            first += 1
+        last = width - 1
+        while old_page[last] == new_page[last]:
+            last -= 1
+        ranges.append((page, first, last))
+    return ranges
+
+
+class PageFlusher:
+    """Sends only the changed columns of each SSD1306 page over the bus"""
+
+    def __init__(self, device):
+        self.device = device
+        self.last_sent: bytes | None = None
+        self.last_flush = {"bytes": 0, "transactions": 0}
+        self.total = {"frames": 0, "bytes": 0, "transactions": 0}
+
+    def invalidate(self):
+        """Resend everything on the next flush (e.g. after a bus error)."""
+        self.last_sent = None
+
+    def flush(self, image: Image.Image):
+        image = self.device.preprocess(image)
+        pages = to_pages(image)
+        width = image.width
+        colstart = getattr(self.device, "_colstart", 0)
+
+        sent = transactions = 0
+        try:
+            for page, first, last in dirty_ranges(self.last_sent, pages, width):
+                self.device.command(
+                    COLUMNADDR, colstart + first, colstart + last, PAGEADDR, page, page
+                )
+                self.device.data(list(pages[page * width + first : page * width + last + 1]))
+                sent += last - first + 1
+                transactions += 2
+        except Exception:
+            self.invalidate()
+            raise
+
+        self.last_sent = pages
+        self.last_flush = {"bytes": sent, "transactions": transactions}
+        self.total["frames"] += 1
+        self.total["bytes"] += sent
+        self.total["transactions"] += transactions
+
+
+class DisplayWorker:
+    """Flushes frames on a dedicated thread through a single, latest-wins slot
+
+    submit() never blocks: a frame that is still waiting when a newer one arrives
+    is dropped, so a stalled bus cannot back up the callers.
+    """
+
+    def __init__(self, flush: Callable[[Image.Image], None]):
+        self.flush = flush
+        self.dropped = 0
+        self._pending: Image.Image | None = None
+        self._busy = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="display", daemon=True)
+        self._thread.start()
+
+    def submit(self, frame: Image.Image):
+        with self._condition:
+            if self._pending is not None:
+                self.dropped += 1
+                DROPPED_FRAMES.inc()
+            self._pending = frame
+            self._condition.notify_all()
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Wait until every submitted frame has been flushed or dropped."""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._pending is None and not self._busy, timeout
+            )
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None)
+                frame, self._pending = self._pending, None
+                self._busy = True
+            try:
+                with FLUSH.time():
+                    self.flush(frame)
+            except Exception:
+                log.exception("Error flushing display")
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
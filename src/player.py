@@ -0,0 +1,212 @@
+from typing import Callable
+import threading
+import time
+from . import metrics
+
+VLC_ARGS = ("--no-video", "--aout=alsa", "--verbose=1")
+# For measuring playback without a sound card (tests, benchmarks)
+NULL_AUDIO_ARGS = ("--no-video", "--aout=dummy", "--verbose=0")
+
+VOLUME = 100
+# Seconds the standby stream may take to buffer before a switch is given up
+SWITCH_TIMEOUT = 10.0
+# Interval between volume steps of a crossfade
+_FADE_STEP = 0.05
+
+
+def _phase_histogram(phase: str) -> metrics.Histogram:
+    return metrics.histogram(
+        "ticki_player_seconds", "Duration of player startup phases", slow=5.0, phase=phase
+    )
+
+
+PHASES = {
+    phase: _phase_histogram(phase)
+    for phase in ("instance_creation", "media_open", "buffering", "first_audio", "switch")
+}
+
+
+class PlayerEngine:
+    """Owns one VLC instance and its media players for the lifetime of the process
+
+    Creating a vlc.Instance (and the ALSA output behind it) is slow on the Pi, so
+    it is created once. A stream can be pre-buffered muted and unmuted later,
+    e.g. right before an alarm fires.
+
+    While playing, switch() buffers the new stream on a standby player and only
+    swaps it in (optionally crossfading) once it is ready, so there is no silence
+    between stations. The previous player becomes the standby for the next switch.
+
+    Timings in seconds are kept in `timings`:
+    - instance_creation: creating the VLC instance and media player
+    - media_open: creating the media for a URL
+    - buffering: play() until VLC reports a full buffer
+    - first_audio: play() until playback time starts advancing
+    - switch: switch() until the new stream is audible
+
+    Functions in `listeners` are called with ("buffering", cache %), ("end",) or
+    ("error",) for events of the active player. They run on VLC's event thread and
+    must not call back into the player.
+    """
+
+    def __init__(self, args: tuple[str, ...] = VLC_ARGS, vlc_module=None, volume: int = VOLUME):
+        if vlc_module is None:
+            import vlc
+
+            vlc_module = vlc
+        self.vlc = vlc_module
+        self.args = args
+        self.volume = volume
+        self.timings: dict[str, float] = {}
+        self.url: str | None = None
+        self.muted = False
+        self._instance = None
+        self._player = None
+        self._standby = None
+        # Set once a player's stream is buffered or playing, by player id
+        self._ready: dict[int, threading.Event] = {}
+        self._play_started: float | None = None
+        self.listeners: list[Callable[..., None]] = []
+
+    @property
+    def player(self):
+        """The active media player, creating the VLC instance on first use."""
+        if self._player is None:
+            start = time.perf_counter()
+            self._instance = self.vlc.Instance(*self.args)
+            if not self._instance:
+                raise RuntimeError("Failed to create VLC instance")
+            self._player = self._new_player()
+            self._record("instance_creation", start)
+        return self._player
+
+    def load(self, url: str):
+        """Stop playback and load url into the player."""
+        player = self.player
+        player.stop()
+        self._ready[id(player)].clear()
+        start = time.perf_counter()
+        player.set_media(self._instance.media_new(url))
+        self._record("media_open", start)
+        self.url = url
+
+    def play(self, muted: bool = False) -> bool:
+        """Start playing the loaded media, optionally muted for pre-buffering."""
+        self.set_muted(muted)
+        self._play_started = time.perf_counter()
+        self.timings.pop("buffering", None)
+        self.timings.pop("first_audio", None)
+        return self.player.play() != -1
+
+    def switch(self, url: str, crossfade: float = 0.0, timeout: float = SWITCH_TIMEOUT) -> bool:
+        """
+        Switch the playing stream to url without a gap.
+
+        The current stream keeps playing until the new one has buffered. Returns
+        False, leaving the current stream playing, if the new one can't be
+        started within timeout seconds.
+        """
+        start = time.perf_counter()
+        active = self.player
+        if self._standby is None:
+            self._standby = self._new_player()
+        standby = self._standby
+
+        ready = self._ready[id(standby)]
+        ready.clear()
+        standby.set_media(self._instance.media_new(url))
+        standby.audio_set_volume(0)
+        standby.audio_set_mute(self.muted)
+        if standby.play() == -1 or not ready.wait(timeout):
+            standby.stop()
+            return False
+
+        self._crossfade(active, standby, crossfade)
+        active.stop()
+        # Recycle the old player as the next standby
+        active.audio_set_volume(self.volume)
+        self._player, self._standby = standby, active
+        self.url = url
+        self._record("switch", start)
+        return True
+
+    def set_muted(self, muted: bool):
+        self.muted = muted
+        self.player.audio_set_mute(muted)
+
+    def has_audio(self) -> bool:
+        """Whether the loaded stream has buffered or started playing."""
+        return self._player is not None and self._ready[id(self._player)].is_set()
+
+    def is_playing(self) -> bool:
+        return self._player is not None and bool(self._player.is_playing())
+
+    def stop(self):
+        if self._player is not None:
+            self._player.stop()
+        self.muted = False
+
+    def release(self):
+        for player in (self._player, self._standby):
+            if player is not None:
+                player.stop()
+                player.release()
+        if self._instance is not None:
+            self._instance.release()
+        self._player = None
+        self._standby = None
+        self._instance = None
+
+    def _new_player(self):
+        player = self._instance.media_player_new()
+        if not player:
+            raise RuntimeError("Failed to create media player")
+        self._ready[id(player)] = threading.Event()
+        events = player.event_manager()
+        events.event_attach(self.vlc.EventType.MediaPlayerBuffering, self._on_buffering, player)
+        events.event_attach(
+            self.vlc.EventType.MediaPlayerTimeChanged, self._on_time_changed, player
+        )
+        events.event_attach(self.vlc.EventType.MediaPlayerEndReached, self._on_end, player, "end")
+        events.event_attach(
+            self.vlc.EventType.MediaPlayerEncounteredError, self._on_end, player, "error"
+        )
+        return player
+
+    def _crossfade(self, old, new, duration: float):
+        steps = max(1, round(duration / _FADE_STEP))
+        for step in range(1, steps + 1):
+            volume = self.volume * step // steps
+            new.audio_set_volume(volume)
+            old.audio_set_volume(self.volume - volume)
+            if step < steps:
+                time.sleep(duration / steps)
+
+    def _notify(self, player, kind: str, *args):
+        if player is self._player:
+            for listener in self.listeners:
+                listener(kind, *args)
+
+    def _on_buffering(self, event, player):
+        self._notify(player, "buffering", event.u.new_cache)
+        if event.u.new_cache < 100.0:
+            return
+        self._ready[id(player)].set()
+        if player is self._player and self._play_started is not None:
+            if "buffering" not in self.timings:
+                self._record("buffering", self._play_started)
+
+    def _on_time_changed(self, event, player):
+        if event.u.new_time <= 0:
+            return
+        self._ready[id(player)].set()
+        if player is self._player and self._play_started is not None:
+            if "first_audio" not in self.timings:
+                self._record("first_audio", self._play_started)
+
+    def _on_end(self, event, player, kind: str):
+        self._notify(player, kind)
+
+    def _record(self, phase: str, start: float):
+        self.timings[phase] = time.perf_counter() - start
+        PHASES[phase].observe(self.timings[phase])
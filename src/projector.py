@@ -1,143 +1,106 @@
-from unittest.mock import MagicMock
-import time
-import csv
+from array import array
 from pathlib import Path
+import threading
+from .animation import CACHE_DIR, AnimationPlayer, Playback, load_timeline
 from .seven_segment_utils import MINUTE_ONES, MINUTE_TENS, HOUR_ONES
+from .change_tracker import ChangeTracker
+from . import metrics
+from .transport import Transport, create_transport
 
-try:
-    import board
-    import digitalio
+# Number of bits in a frame: 1 prefix bit followed by the 5-byte event
+FRAME_BITS = 41
 
-    IS_RASPBERRY_PI = True
-except (ImportError, NotImplementedError):
-    IS_RASPBERRY_PI = False
-
-if not IS_RASPBERRY_PI:
-
-    class MockDigitalInOut:
-        """Mock implementation of digitalio.DigitalInOut"""
-
-        def __init__(self, pin):
-            self._value = False
-            self.direction = None
-
-        @property
-        def value(self) -> bool:
-            return self._value
-
-        @value.setter
-        def value(self, val: bool):
-            self._value = val
-
-    class MockDirection:
-        """Mock implementation of digitalio.Direction"""
-
-        OUTPUT = "output"
-        INPUT = "input"
-
-    class MockBoard:
-        """Mock implementation of board pins"""
-
-        SCK = "SCK"
-        MOSI = "MOSI"
-        CE0 = "CE0"
-
-    digitalio = MagicMock()
-    digitalio.DigitalInOut = MockDigitalInOut
-    digitalio.Direction = MockDirection
-    board = MockBoard()
-    print("Running with mock hardware (development mode)")
+FRAME_WRITE = metrics.histogram(
+    "ticki_projector_frame_write_seconds", "Time to send one frame to the projector", slow=0.01
+)
+SEND_TIME = metrics.histogram(
+    "ticki_projector_send_time_seconds", "Time spent in Projector.send_time", slow=0.05
+)
+SKIPPED_WRITES = metrics.counter(
+    "ticki_projector_skipped_writes_total", "Time updates skipped because nothing changed"
+)
 
 
 class Projector:
-    """Manages SPI communication with 7-segment time projector using bit-banging"""
+    """Manages SPI communication with 7-segment time projector"""
 
-    def __init__(self):
-        """Initialize the display controller with bit-banged SPI."""
-        # Setup GPIO pins for bit-banging
-        self.sck = digitalio.DigitalInOut(board.SCK)
-        self.mosi = digitalio.DigitalInOut(board.MOSI)
-        self.enable = digitalio.DigitalInOut(board.CE0)
-        self.sck.direction = digitalio.Direction.OUTPUT
-        self.mosi.direction = digitalio.Direction.OUTPUT
-        self.enable.direction = digitalio.Direction.OUTPUT
+    def __init__(self, transport: Transport | None = None, cache_dir: Path = CACHE_DIR):
+        """Initialize the display controller on the given (or configured) transport.
 
-        self.replay_from_csv(Path(__file__).parent / "startup.csv")
+        Compiled pin captures are cached in cache_dir.
+        """
+        self.transport = transport or create_transport()
+        self.cache_dir = cache_dir
+        self.time_tracker = ChangeTracker()
+        # Serializes frames and animations on the transport
+        self._lock = threading.RLock()
 
         # pins idle high
-        self.sck.value = True
-        self.mosi.value = True
-        self.enable.value = True
-
-    def bitbang_write(self, data: list[bool], num_bits: int):
-        """Send data over SPI using bit-banging."""
-        self.enable.value = False
-        time.sleep(0.0000005)
-        for bit in data[:num_bits]:
-            self.mosi.value = bit
-            self.sck.value = False
-            time.sleep(0.000000001)
-            self.sck.value = True
-            time.sleep(0.000001)
-        self.mosi.value = True
-        time.sleep(0.000001)
-        self.enable.value = True
-        time.sleep(0.000001)
-
-    def send_time(self, hours: int, minutes: int):
-        """Send the time to the display."""
-        data = self.create_clock_event(hours, minutes)
-        if len(data) != 5:
-            raise ValueError("Data must be exactly 5 bytes")
-
-        # Convert bytes to list of bits, starting with 1 prefix bit
-        bits = [True]  # Prefix bit
-        for byte in data:
-            # Convert each byte to 8 bits, MSB first
-            bits.extend(bool((byte >> i) & 1) for i in range(7, -1, -1))
-
-        self.bitbang_write(bits, num_bits=41)  # Send all 41 bits
+        self.transport.idle()
+
+        self.animations: AnimationPlayer | None = None
+        if self.transport.supports_pins:
+            self.animations = AnimationPlayer(
+                self.transport.set_pins, self._lock, on_finished=self._after_animation
+            )
+            self.startup = self.replay_from_csv(Path(__file__).parent / "startup.csv")
+
+    def close(self):
+        """Stop the animation thread and release the transport's hardware."""
+        if self.animations is not None:
+            self.animations.stop()
+        self.transport.close()
+
+    def write_frame(self, frame: int, num_bits: int = FRAME_BITS):
+        """Send a packed frame (MSB first) to the projector."""
+        with self._lock, FRAME_WRITE.time():
+            self.transport.write_frame(frame, num_bits)
+
+    def send_time(self, hours: int, minutes: int, force: bool = False):
+        """Send the time to the display, unless it is already showing that time."""
+        if 0 <= hours < 24 and 0 <= minutes < 60:
+            frame = CLOCK_FRAMES[hours * 60 + minutes]
+        else:
+            # Out-of-range times (e.g. from set_single_time.py) are not in the table
+            frame = pack_frame(self.create_clock_event(hours, minutes))
+
+        with self._lock, SEND_TIME.time():
+            if force:
+                self.time_tracker.invalidate()
+            if not self.time_tracker.changed(frame):
+                SKIPPED_WRITES.inc()
+                return
+
+            try:
+                self.write_frame(frame)
+            except Exception:
+                self.time_tracker.invalidate()
+                raise
 
     def send_binary_event(self, binary_data: str):
         """Send binary data directly to the display."""
-        if len(binary_data) != 41:
+        if len(binary_data) != FRAME_BITS:
             raise ValueError("Binary data must be exactly 41 bits long")
 
-        # Convert string of '0' and '1' to list of booleans
-        bits = [bool(int(bit)) for bit in binary_data]
-        self.bitbang_write(bits, num_bits=41)
-
-    def replay_from_csv(self, csv_path: str):
-        """Replay pin changes from a CSV file with columns Time [s],MOSI,CLK,EN."""
-        events: list[tuple[float, bool, bool, bool]] = []
-
-        # Read and parse CSV
-        with open(csv_path, "r") as f:
-            reader = csv.DictReader(f)
-            last_time = None
-
-            for row in reader:
-                current_time = float(row["Time [s]"])
-                if last_time is None:
-                    last_time = current_time
-
-                # Store relative time difference and pin states
-                events.append(
-                    (
-                        current_time - last_time,  # relative time difference
-                        bool(int(row["MOSI"])),
-                        bool(int(row["CLK"])),
-                        bool(int(row["EN"])),
-                    )
-                )
-                last_time = current_time
-
-        for delay, mosi, clk, en in events:
-            if delay > 0:
-                time.sleep(delay)
-            self.mosi.value = mosi
-            self.sck.value = clk
-            self.enable.value = en
+        self.time_tracker.invalidate()
+        self.write_frame(int(binary_data, 2))
+
+    def replay_from_csv(self, csv_path: str | Path) -> Playback:
+        """
+        Queue replaying pin changes from a CSV file with columns Time [s],MOSI,CLK,EN.
+
+        The capture is compiled (and cached) on first use and played on the animation
+        thread; the returned Playback can be waited on or cancelled.
+        """
+        if self.animations is None:
+            raise RuntimeError("The transport cannot replay pin captures")
+
+        return self.animations.play(load_timeline(Path(csv_path), self.cache_dir))
+
+    def _after_animation(self):
+        # The animation overwrote whatever the projector was showing
+        self.transport.idle()
+        self.time_tracker.invalidate()
 
     @staticmethod
     def create_clock_event(hours: int, minutes: int) -> bytes:
@@ -176,3 +139,22 @@ class Projector:
             result[loc.byte] |= 1 << loc.bit
 
         return bytes(result)
+
+
+def pack_frame(event: bytes) -> int:
+    """Pack a 5-byte clock event and its prefix bit into a 41-bit frame."""
+    if len(event) != 5:
+        raise ValueError("Data must be exactly 5 bytes")
+
+    return (1 << 40) | int.from_bytes(event, "big")
+
+
+# All 24 * 60 clock frames, indexed by hours * 60 + minutes
+CLOCK_FRAMES = array(
+    "Q",
+    (
+        pack_frame(Projector.create_clock_event(hours, minutes))
+        for hours in range(24)
+        for minutes in range(60)
+    ),
+)
@@ -1,15 +1,34 @@
+from concurrent.futures import Future
 from dataclasses import dataclass
-from datetime import datetime, time, timedelta
+from datetime import date, datetime, timedelta
 from pathlib import Path
-import requests
-import vlc
+from typing import TYPE_CHECKING, Callable
+import logging
+import threading
+import time as time_module
+from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED, EVENT_JOB_MISSED
 from apscheduler.schedulers.background import BackgroundScheduler
-from .weather import Weather
+from .alarms import Alarm, AlarmSchedule, describe
+from .clock import MinuteClock
+from .commands import CommandExecutor
+from .events import StateBroadcaster
+from .health import StreamMonitor
+from . import metrics
+from .store import StateStore
+from . import netio
+from .player import PlayerEngine
+from .recorder import StreamRecorder
+from .streams import StreamResolver
+from .weather import Weather, WeatherService
 from .projector import Projector
-from .display import Display
 
+if TYPE_CHECKING:
+    from .display import Display
 
-@dataclass
+log = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
 class Station:
     name: str
     url: str
@@ -29,187 +48,534 @@ STATIONS: dict[str, Station] = {
 }
 
 
-@dataclass
-class Alarm:
-    time: str | None = None
-    enabled: bool = False
+# Each /events client holds one of the 12 gunicorn threads (see ticki.service) while
+# its stream is open. Commands can block a thread for up to 40 s, so most threads
+# are kept free for them; clients beyond the limit poll /state instead.
+EVENT_CLIENTS = 4
+
+# Seconds before an alarm at which its station starts buffering (muted)
+ALARM_PREBUFFER_SECONDS = 20
+
+# Volume crossfade when switching stations while playing
+STATION_CROSSFADE_SECONDS = 0.5
 
-    def to_dict(self):
-        return {"time": self.time, "enabled": self.enabled}
+# Seconds before an alarm at which its station starts being recorded to disk
+ALARM_RECORD_SECONDS = 10 * 60
+# Seconds after an alarm fired until the live stream must be audible
+ALARM_AUDIO_DEADLINE = 3.0
+# Seconds between attempts to get from the fallback audio back to the live stream
+LIVE_RETRY_SECONDS = 30
+# Played if the live stream fails and nothing has been recorded
+FALLBACK_URL = STATIONS["last-christmas"].url
+
+JOB_LAG = metrics.histogram(
+    "ticki_scheduler_job_lag_seconds",
+    "Time from a job's scheduled run time until it finished",
+    slow=1.0,
+)
+JOB_MISSED = metrics.counter("ticki_scheduler_jobs_missed_total", "Jobs that missed their time")
+JOB_ERRORS = metrics.counter("ticki_scheduler_job_errors_total", "Jobs that raised")
 
 
 class Radio:
-    def __init__(self):
+    def __init__(
+        self,
+        alarm_prebuffer_seconds: float = ALARM_PREBUFFER_SECONDS,
+        store: StateStore | None = None,
+    ):
         self.current_station = STATIONS["srf2"]
-        self.player = None
+        self.stream_url: str | None = None
         self.is_playing = False
-        self.alarms = [Alarm(), Alarm()]
-        self.alarm_jobs = [None, None]
+        self.alarms = AlarmSchedule()
+        self.alarm_prebuffer_seconds = alarm_prebuffer_seconds
         self.scheduler = BackgroundScheduler()
+        self.scheduler.add_listener(
+            self._on_job_event, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED
+        )
         self.scheduler.start()
 
+        self.store = store or StateStore()
+
+        # Every mutation of the player and alarms runs on this one thread
+        self.commands = CommandExecutor()
+
+        # Pushes state changes to connected web clients
+        self.events = StateBroadcaster(max_clients=EVENT_CLIENTS)
+        # The clock, weather and command threads all publish; reading and publishing
+        # the state under one lock keeps an older state from being sent last
+        self._publish_lock = threading.Lock()
+
+        # Subsystems are brought up in the background by start()
+        self.streams = StreamResolver()
+        self.recorder = StreamRecorder(
+            lambda: self.streams.get_stream_url(self.current_station.url)
+        )
+        self.engine: PlayerEngine | None = None
+        # Reconnects the playing stream when it drops
+        self.monitor = StreamMonitor(self._request_reconnect)
+        self.projector: Projector | None = None
+        self.display: "Display | None" = None
+        self.clock: MinuteClock | None = None
+        self.weather_service: WeatherService | None = None
+        self.readiness: dict[str, str] = {}
+        self.startup_timings: dict[str, float] = {}
+        self._ready: dict[str, threading.Event] = {}
+
+        # Alarms and the station survive restarts. Restoring schedules the next
+        # alarm's jobs, so the recorder and the rest must exist by now.
+        self._restore(self.store.load())
+
+    def _restore(self, state: dict):
+        """Apply persisted state and rebuild the alarm jobs from it."""
+        now = datetime.now()
+        if state.get("station") in STATIONS:
+            self.current_station = STATIONS[state["station"]]
+
+        for key, value in state.items():
+            if key.startswith("alarm/"):
+                try:
+                    self.alarms.add(Alarm.from_dict(value), now, int(key.removeprefix("alarm/")))
+                except (KeyError, ValueError, TypeError) as e:
+                    log.warning("Skipping invalid stored alarm %s: %s", key, e)
+
+        if not state:
+            # First start: offer two empty alarms
+            for _ in range(2):
+                self._save_alarm(self.alarms.add(Alarm(), now))
+        self._schedule_next_alarm()
+
+    @staticmethod
+    def _on_job_event(event):
+        if event.code == EVENT_JOB_MISSED:
+            JOB_MISSED.inc()
+            return
+        if event.code == EVENT_JOB_ERROR:
+            JOB_ERRORS.inc()
+        scheduled = event.scheduled_run_time
+        JOB_LAG.observe((datetime.now(scheduled.tzinfo) - scheduled).total_seconds())
+
+    def _save_alarm(self, alarm_id: int):
+        alarm = self.alarms.alarms.get(alarm_id)
+        self.store.set(f"alarm/{alarm_id}", alarm.to_dict() if alarm else None)
+
+    def start(self):
+        """Initialize all subsystems concurrently without blocking the caller."""
+        self._start_subsystem("streams", self._init_streams)
+        self._start_subsystem("projector", self._init_projector)
+        self._start_subsystem("display", self._init_display)
+        self._start_subsystem("player", self._init_player)
+        self._start_subsystem("clock", self._init_clock, after=("projector", "display"))
+        self._start_subsystem("weather", self._init_weather, after=("display",))
+        self.publish_state()
+
+    def is_ready(self) -> bool:
+        return bool(self.readiness) and all(state == "ready" for state in self.readiness.values())
+
+    def wait_ready(self, name: str, timeout: float | None = None) -> bool:
+        """Wait for a subsystem to finish initializing; True if it came up successfully."""
+        return self._ready[name].wait(timeout) and self.readiness[name] == "ready"
+
+    def _start_subsystem(self, name: str, init: Callable[[], None], after: tuple[str, ...] = ()):
+        self.readiness[name] = "pending"
+        self._ready[name] = threading.Event()
+        threading.Thread(
+            target=self._run_subsystem, args=(name, init, after), name=f"init-{name}", daemon=True
+        ).start()
+
+    def _run_subsystem(self, name: str, init: Callable[[], None], after: tuple[str, ...]):
+        start = time_module.perf_counter()
+        try:
+            for dependency in after:
+                if not self.wait_ready(dependency):
+                    raise RuntimeError(f"{dependency} failed")
+            init()
+            self.readiness[name] = "ready"
+        except Exception as e:
+            log.exception("Failed to initialize %s", name)
+            self.readiness[name] = f"failed: {e}"
+        finally:
+            self.startup_timings[name] = time_module.perf_counter() - start
+            self._ready[name].set()
+
+    def _init_streams(self):
+        self.streams.prefetch(station.url for station in STATIONS.values())
+
+    def _init_projector(self):
         self.projector = Projector()
+
+    def _init_display(self):
+        # Pillow and luma are only loaded once the display is brought up
+        from .display import Display
+
         self.display = Display()
 
-        if not self.scheduler.get_job("update_displayed_time"):
-            self.scheduler.add_job(
-                self._update_time,
-                "interval",
-                seconds=1,
-                id="update_displayed_time",
-            )
+    def _init_player(self):
+        self.engine = PlayerEngine()
+        self.engine.listeners.append(self.monitor.on_player_event)
+        self.monitor.start()
+        # Warm up the VLC instance so the first play doesn't pay for it
+        self.engine.player
 
-        if not self.scheduler.get_job("update_weather"):
-            self.scheduler.add_job(
-                self._update_time,
-                "interval",
-                seconds=60,
-                id="update_weather",
-            )
-        self.display.update_weather(Weather.get_weather())
+    def _init_clock(self):
+        self.clock = MinuteClock(self._update_time)
+        self.clock.start()
 
-        self.init_player()
+    def _init_weather(self):
+        self.weather_service = WeatherService(self._on_weather)
+        self.weather_service.start()
 
-    def _update_time(self):
-        current_time = datetime.now()
+    def _update_time(self, current_time: datetime):
         self.projector.send_time(current_time.hour, current_time.minute)
         self.display.update_time(current_time, self.get_next_alarm())
-
-    def _update_weather(self):
-        self.display.update_weather(Weather.get_weather())
+        # The next alarm moves on as alarms pass
+        self.publish_state()
+
+    def _on_weather(self, weather: Weather):
+        self.display.update_weather(weather)
+        self.publish_state()
+
+    def get_state(self) -> dict:
+        """The state shown in the web UI."""
+        weather = self.weather_service.weather if self.weather_service else None
+        return {
+            "playing": self.is_playing,
+            "station": next(
+                key for key, station in STATIONS.items() if station is self.current_station
+            ),
+            "alarms": self.get_alarms(),
+            "next_alarm": self.get_next_alarm(),
+            "weather": weather.print() if weather else None,
+        }
+
+    def publish_state(self):
+        """Send whatever changed in the state to connected web clients."""
+        with self._publish_lock:
+            self.events.publish(self.get_state())
+
+    def get_write_stats(self) -> dict[str, dict[str, int]]:
+        """Performed and skipped device writes since startup."""
+        stats = {}
+        if self.projector:
+            stats["projector"] = self.projector.time_tracker.to_dict()
+        if self.display:
+            stats["display"] = self.display.tracker.to_dict()
+        return stats
 
     def cleanup(self):
+        self.commands.stop(timeout=5)
+        self.monitor.stop()
+        self.recorder.stop()
+        self.store.close()
+        if self.clock:
+            self.clock.stop()
+        if self.weather_service:
+            self.weather_service.stop()
+        self.streams.stop()
+        netio.close()
+        if self.projector:
+            self.projector.close()
+        if self.engine:
+            self.engine.release()
         if self.scheduler.running:
             self.scheduler.shutdown()
 
     def get_stream_url(self):
-        try:
-            if self.current_station.url.endswith(".m3u"):
-                # Handle m3u playlist files
-                print(f"Returning m3u playlist URL: {self.current_station.url}")
-                return requests.get(self.current_station.url).text.strip()
-            # Return direct stream URLs as-is
-            print(f"Returning direct stream URL: {self.current_station.url}")
-            return self.current_station.url
-        except requests.RequestException as e:
-            print(f"Error fetching stream URL: {e}")
-            return None
+        stream_url = self.streams.get_stream_url(self.current_station.url)
+        log.debug("Stream URL for %s: %s", self.current_station.name, stream_url)
+        return stream_url
+
+    def get_stream_health(self) -> dict:
+        """Stalls, underrun durations and reconnects of the played streams since startup."""
+        return dict(self.monitor.stats)
+
+    def get_player_timings(self) -> dict[str, float]:
+        """Seconds spent creating the VLC instance, opening media, buffering and until audio."""
+        return dict(self.engine.timings) if self.engine else {}
 
     def init_player(self):
         try:
-            if self.player:
-                self.player.stop()
-                self.player.release()
-            instance = vlc.Instance("--no-video", "--aout=alsa", "--verbose=1")
-            if not instance:
-                print("Failed to create VLC instance")
+            if not self.wait_ready("player", timeout=30):
+                log.warning("Player is not available")
                 return False
 
-            self.player = instance.media_player_new()
-            if not self.player:
-                print("Failed to create media player")
+            self.stream_url = self.get_stream_url()
+            if not self.stream_url:
+                log.warning("Failed to get stream URL")
                 return False
 
-            stream_url = self.get_stream_url()
-
-            if stream_url:
-                self.player.set_media(instance.media_new(stream_url))
-                return True
+            self.engine.load(self.stream_url)
+            return True
+        except Exception:
+            log.exception("Error initializing player")
+            return False
 
-            print("Failed to get stream URL")
+    def play_radio(self) -> Future:
+        """Start playing; play and stop requests in quick succession only apply the last one."""
+        return self.commands.submit(self._play_radio, key="playback")
+
+    def stop_radio(self) -> Future:
+        return self.commands.submit(self._stop_radio, key="playback")
+
+    def set_station(self, station_name: str) -> Future:
+        """Switch stations, continuing playback if the radio is playing.
+
+        Rapid station changes are coalesced so that only the last one is loaded.
+        """
+        if station_name not in STATIONS:
+            future: Future = Future()
+            future.set_result(False)
+            return future
+        return self.commands.submit(self._set_station, station_name, key="station")
+
+    def set_alarm(
+        self,
+        alarm_time: str | None,
+        enabled: bool,
+        alarm_id: int,
+        days: frozenset[int] = frozenset(),
+        on: date | None = None,
+    ) -> Future:
+        alarm = Alarm(alarm_time, enabled, days, on)
+        return self.commands.submit(self._set_alarm, alarm_id, alarm, key=("alarm", alarm_id))
+
+    def add_alarm(self) -> Future:
+        """Add a disabled alarm; the future resolves to its id."""
+        return self.commands.submit(self._add_alarm)
+
+    def delete_alarm(self, alarm_id: int) -> Future:
+        return self.commands.submit(self._delete_alarm, alarm_id)
+
+    def skip_alarm(self, alarm_id: int) -> Future:
+        """Skip the next occurrence of an alarm."""
+        return self.commands.submit(self._skip_alarm, alarm_id)
+
+    def fire_alarm(self) -> Future:
+        return self.commands.submit(self._fire_alarm)
+
+    def prebuffer_alarm(self) -> Future:
+        return self.commands.submit(self._prebuffer_alarm)
+
+    def _play_radio(self):
+        if self.is_playing:
             return False
-        except Exception as e:
-            print(f"Error initializing player: {e}")
+
+        if (
+            self.engine is not None
+            and self.engine.muted
+            and self.engine.is_playing()
+            and self.engine.url == self.get_stream_url()
+        ):
+            # Pre-buffered for an alarm: just turn the sound on
+            self.engine.set_muted(False)
+        elif not self.init_player():
             return False
+        elif not self.engine.play() and self.stream_url:
+            # The stream could not be opened: fail over to the next playlist entry
+            self.streams.failover(self.current_station.url, self.stream_url)
+            if not self.init_player() or not self.engine.play():
+                return False
 
-    def play_radio(self):
-        if not self.player or not self.is_playing:
-            if self.init_player():
-                self.player.play()
-                self.is_playing = True
-                # Add auto-stop job that runs once after 10 minutes
-                self.scheduler.add_job(
-                    self.stop_radio,
-                    "date",
-                    run_date=datetime.now() + timedelta(seconds=10),
-                    id="auto_stop",
-                )
-                return True
-        return False
+        self.is_playing = True
+        self.monitor.arm()
+        # Add auto-stop job that runs once after 10 minutes
+        self.scheduler.add_job(
+            self.stop_radio,
+            "date",
+            run_date=datetime.now() + timedelta(seconds=10),
+            id="auto_stop",
+            replace_existing=True,
+        )
+        self.publish_state()
+        return True
+
+    def _prebuffer_alarm(self):
+        """Start the alarm station muted so that it is audible the instant the alarm fires."""
+        if self.is_playing:
+            return
+
+        if self.init_player() and self.engine.play(muted=True):
+            # Don't keep streaming silently if the alarm doesn't fire (e.g. it was disabled)
+            self.scheduler.add_job(
+                self.commands.submit,
+                "date",
+                args=(self._end_prebuffer,),
+                run_date=datetime.now() + timedelta(seconds=self.alarm_prebuffer_seconds + 60),
+                id="end_prebuffer",
+                replace_existing=True,
+            )
 
-    def stop_radio(self):
-        if self.player and self.is_playing:
-            self.player.stop()
-            self.is_playing = False
-            return True
-        return False
+    def _end_prebuffer(self):
+        if not self.is_playing and self.engine.muted:
+            self.engine.stop()
 
-    def set_station(self, station_name: str) -> bool:
-        if station_name in STATIONS:
-            self.current_station = STATIONS[station_name]
-            print(f"Current station is now {self.current_station.name}")
-            self.stop_radio()
-            print("Stopping radio")
-            self.init_player()
-            print(f"Station was set to {STATIONS[station_name].name}")
+    def _stop_radio(self):
+        # Stopping acknowledges a ringing alarm: no fallback audio or switch to live after it
+        for job_id in ("alarm_deadline", "go_live"):
+            if self.scheduler.get_job(job_id):
+                self.scheduler.remove_job(job_id)
+
+        if self.is_playing:
+            self.monitor.disarm()
+            self.engine.stop()
+            self.is_playing = False
+            self.publish_state()
             return True
         return False
 
-    def set_alarm(self, alarm_time: str, enabled: bool, alarm_index: int) -> bool:
-        try:
-            print(f"Setting alarm {alarm_index} to {alarm_time} with enabled={enabled}")
-            if alarm_index not in [0, 1]:
-                raise ValueError("Invalid alarm index")
-
-            self.alarms[alarm_index] = Alarm(alarm_time, enabled)
-            print(f"s: {self.alarms}")
-
-            # Remove existing job if it exists
-            if self.alarm_jobs[alarm_index]:
-                print(f"Removing existing job {self.alarm_jobs[alarm_index].id}")
-                self.scheduler.remove_job(self.alarm_jobs[alarm_index].id)
-                self.alarm_jobs[alarm_index] = None
+    def _request_reconnect(self, attempt: int) -> bool:
+        """Called by the monitor thread; the reconnect itself runs as a command."""
+        return self.commands.submit(self._reconnect, attempt).result()
 
-            if self.alarms[alarm_index].enabled and self.alarms[alarm_index].time:
-                print(f"Adding new job for alarm {alarm_index}")
-                try:
-                    self.alarm_jobs[alarm_index] = self.scheduler.add_job(
-                        self.play_radio,
-                        "cron",
-                        hour=self.alarms[alarm_index].time.split(":")[0],
-                        minute=self.alarms[alarm_index].time.split(":")[1],
-                        id=f"alarm_trigger_{alarm_index}",
-                    )
-                    print(f"Job added successfully for alarm {alarm_index}")
-                except Exception as e:
-                    print(f"Error adding job for alarm {alarm_index}: {e}")
+    def _reconnect(self, attempt: int) -> bool:
+        """Reload the dropped stream, moving on to the next playlist entry after a failed retry."""
+        if not self.is_playing:
+            return False
+        if attempt and self.stream_url:
+            self.streams.failover(self.current_station.url, self.stream_url)
+        # The resolved stream URL is cached, so this doesn't refetch the playlist
+        log.warning("Stream dropped, reconnecting (attempt %d)", attempt + 1)
+        return self.init_player() and self.engine.play()
+
+    def _set_station(self, station_name: str) -> bool:
+        was_playing = self.is_playing
+        self.current_station = STATIONS[station_name]
+        self.store.set("station", station_name)
+        log.info("Current station is now %s", self.current_station.name)
+        if not was_playing:
+            self.init_player()
+        else:
+            stream_url = self.get_stream_url()
+            # The old station keeps playing until the new one has buffered
+            if stream_url and self.engine.switch(stream_url, crossfade=STATION_CROSSFADE_SECONDS):
+                self.stream_url = stream_url
             else:
-                print(f"Alarm {alarm_index} is not enabled or time is not set")
-
-            print(f"Alarms: {self.alarms}")
-            print(f"Alarm jobs: {self.alarm_jobs}")
-            return True
-        except Exception as e:
-            print(f"Error setting alarm: {e}")
+                log.warning("Standby player did not come up, restarting playback")
+                self._stop_radio()
+                self._play_radio()
+        log.debug("Station was set to %s", STATIONS[station_name].name)
+        self.publish_state()
+        return True
+
+    def _set_alarm(self, alarm_id: int, alarm: Alarm) -> bool:
+        log.info("Setting alarm %s to %s", alarm_id, alarm)
+        try:
+            self.alarms.update(alarm_id, alarm, datetime.now())
+        except (KeyError, ValueError) as e:
+            log.warning("Error setting alarm: %s", e)
             return False
+        self._save_alarm(alarm_id)
+        self._alarms_changed()
+        return True
 
-    def get_next_alarm(self) -> str | None:
-        now = datetime.now().time()
-        next_alarm = None
-        next_alarm_time = None
+    def _add_alarm(self) -> int:
+        alarm_id = self.alarms.add(Alarm(), datetime.now())
+        self._save_alarm(alarm_id)
+        self._alarms_changed()
+        return alarm_id
 
-        for alarm in self.alarms:
-            if not alarm.enabled or not alarm.time:
-                continue
+    def _delete_alarm(self, alarm_id: int) -> bool:
+        try:
+            self.alarms.remove(alarm_id)
+        except KeyError:
+            return False
+        self._save_alarm(alarm_id)
+        self._alarms_changed()
+        return True
 
-            alarm_parts = alarm.time.split(":")
-            alarm_time = time(int(alarm_parts[0]), int(alarm_parts[1]))
+    def _skip_alarm(self, alarm_id: int) -> bool:
+        try:
+            skipped = self.alarms.skip_next(alarm_id, datetime.now())
+        except KeyError:
+            return False
+        self._save_alarm(alarm_id)
+        self._alarms_changed()
+        return skipped is not None
+
+    def _fire_alarm(self):
+        self._play_radio()
+        # The recorder thread winds down on its own; joining it here would hold up commands
+        self.recorder.stop(wait=False)
+        self.scheduler.add_job(
+            self.commands.submit,
+            "date",
+            args=(self._ensure_alarm_audio,),
+            run_date=datetime.now() + timedelta(seconds=ALARM_AUDIO_DEADLINE),
+            id="alarm_deadline",
+            replace_existing=True,
+        )
+        # Queue the following alarm
+        self._alarms_changed()
+
+    def _ensure_alarm_audio(self):
+        """Play recorded or bundled audio if the live stream isn't audible by the deadline."""
+        if self.engine is None or (self.is_playing and self.engine.has_audio()):
+            return
+
+        log.warning("Live stream is not playing, falling back to local audio")
+        self.engine.load(self.recorder.playlist() or FALLBACK_URL)
+        if not self.engine.play():
+            return
+        self.is_playing = True
+        self.publish_state()
+        self.scheduler.add_job(
+            self.commands.submit,
+            "interval",
+            args=(self._go_live,),
+            seconds=LIVE_RETRY_SECONDS,
+            id="go_live",
+            replace_existing=True,
+        )
+
+    def _go_live(self):
+        """Switch from fallback audio to the live stream once it buffers."""
+        if not self.is_playing:
+            self.scheduler.remove_job("go_live")
+            return
+
+        stream_url = self.get_stream_url()
+        if stream_url and self.engine.switch(stream_url):
+            self.stream_url = stream_url
+            self.scheduler.remove_job("go_live")
+
+    def _alarms_changed(self):
+        """Schedule the next alarm and show it."""
+        self._schedule_next_alarm()
+        # Show the new next alarm right away instead of at the next minute tick.
+        # Only the alarm text is refreshed: the time is owned by the clock thread.
+        if self.display:
+            self.display.update_alarm(self.get_next_alarm())
+        self.publish_state()
+
+    def _schedule_next_alarm(self):
+        """Only the earliest alarm has scheduler jobs: one to buffer its station and one to play."""
+        for job_id in ("alarm_trigger", "alarm_prebuffer", "alarm_record"):
+            if self.scheduler.get_job(job_id):
+                self.scheduler.remove_job(job_id)
+
+        now = datetime.now()
+        upcoming = self.alarms.next(now)
+        if upcoming is None:
+            return
+
+        at, _ = upcoming
+        self.scheduler.add_job(self.fire_alarm, "date", run_date=at, id="alarm_trigger")
+        # Keep recent audio of the station on disk in case the network is down at alarm time
+        self.scheduler.add_job(
+            self.recorder.start,
+            "date",
+            run_date=max(at - timedelta(seconds=ALARM_RECORD_SECONDS), now),
+            id="alarm_record",
+        )
+        prebuffer_at = at - timedelta(seconds=self.alarm_prebuffer_seconds)
+        if prebuffer_at > now:
+            self.scheduler.add_job(
+                self.prebuffer_alarm, "date", run_date=prebuffer_at, id="alarm_prebuffer"
+            )
 
-            if next_alarm_time is None or (
-                (now > alarm_time and (next_alarm_time is None or alarm_time < next_alarm_time))
-                or (now < alarm_time and (next_alarm_time is None or alarm_time < next_alarm_time))
-            ):
-                next_alarm_time = alarm_time
-                next_alarm = alarm.time
+    def get_alarms(self) -> list[dict]:
+        return [{"id": alarm_id, **alarm.to_dict()} for alarm_id, alarm in self.alarms.items()]
 
-        return next_alarm
+    def get_next_alarm(self) -> str | None:
+        now = datetime.now()
+        upcoming = self.alarms.next(now)
+        return describe(upcoming[0], now) if upcoming else None
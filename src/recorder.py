@@ -0,0 +1,146 @@
+from pathlib import Path
+from typing import Callable, Iterable
+import logging
+import threading
+from .netio import http_get
+
+log = logging.getLogger(__name__)
+
+BUFFER_DIR = Path.home() / ".cache" / "ticki" / "alarm-buffer"
+
+# About 20 minutes of a 96 kbit/s stream, kept in 1 MB segment files
+MAX_BYTES = 16 * 1024 * 1024
+SEGMENT_BYTES = 1024 * 1024
+# Audio is collected in memory and written in appends of this size
+WRITE_BYTES = 256 * 1024
+# Seconds without audio before a read gives up. Kept short so that a stopped
+# recorder notices promptly; a stalled stream is reopened after retry_delay.
+READ_TIMEOUT = 3
+
+
+def open_stream(url: str) -> Iterable[bytes]:
+    """Stream the audio at url in chunks."""
+    # (connect, read) timeouts: a stalled stream ends the recording instead of hanging
+    response = http_get(url, timeout=(5, READ_TIMEOUT), stream=True)
+    return response.iter_content(chunk_size=16 * 1024)
+
+
+class StreamRecorder:
+    """Records a station into a size-capped ring buffer of segment files
+
+    The buffer survives restarts, so an alarm can play recent audio of its
+    station right away even when the network is down. Audio is written in large
+    sequential appends; once the buffer exceeds max_bytes the oldest segment is
+    deleted.
+    """
+
+    def __init__(
+        self,
+        url_provider: Callable[[], str | None],
+        directory: Path = BUFFER_DIR,
+        max_bytes: int = MAX_BYTES,
+        segment_bytes: int = SEGMENT_BYTES,
+        write_bytes: int = WRITE_BYTES,
+        open_stream: Callable[[str], Iterable[bytes]] = open_stream,
+        retry_delay: float = 10.0,
+    ):
+        self.url_provider = url_provider
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self.write_bytes = write_bytes
+        self.open_stream = open_stream
+        self.retry_delay = retry_delay
+        self.writes = 0
+        self.bytes_written = 0
+        self._pending = bytearray()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def segments(self) -> list[Path]:
+        """Segment files, oldest first."""
+        return sorted(self.directory.glob("*.seg"))
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            if not self._stop.is_set():
+                return
+            # Still winding down after stop(wait=False)
+            self._thread.join()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="recorder", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True):
+        """Stop recording; without wait, the recorder thread writes what it has when it ends."""
+        self._stop.set()
+        if not wait:
+            return
+        if self._thread:
+            # At most a connect or a read timeout
+            self._thread.join(timeout=5 + READ_TIMEOUT)
+            self._thread = None
+        self.flush()
+
+    def playlist(self) -> str | None:
+        """A file:// URL of an M3U playlist of the buffered audio, or None if there is none."""
+        with self._lock:
+            segments = self.segments()
+            if not segments:
+                return None
+            path = self.directory / "buffer.m3u"
+            path.write_text("".join(f"{segment.resolve()}\n" for segment in segments))
+            return path.resolve().as_uri()
+
+    def append(self, chunk: bytes):
+        with self._lock:
+            self._pending += chunk
+            full = len(self._pending) >= self.write_bytes
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Write the collected audio to the current segment."""
+        with self._lock:
+            if not self._pending:
+                return
+            self.directory.mkdir(parents=True, exist_ok=True)
+            segments = self.segments()
+            if not segments or segments[-1].stat().st_size >= self.segment_bytes:
+                number = int(segments[-1].stem) + 1 if segments else 0
+                segments.append(self.directory / f"{number:08d}.seg")
+            with open(segments[-1], "ab") as f:
+                f.write(self._pending)
+            self.writes += 1
+            self.bytes_written += len(self._pending)
+            self._pending.clear()
+            self._evict(segments)
+
+    def _evict(self, segments: list[Path]):
+        sizes = [segment.stat().st_size for segment in segments]
+        total = sum(sizes)
+        # Never delete the segment being written
+        for segment, size in zip(segments[:-1], sizes):
+            if total <= self.max_bytes:
+                break
+            segment.unlink()
+            total -= size
+
+    def record(self, url: str):
+        """Record url until the stream ends or the recorder is stopped."""
+        try:
+            for chunk in self.open_stream(url):
+                if self._stop.is_set():
+                    break
+                self.append(chunk)
+        except Exception as e:
+            log.warning("Recording interrupted: %s", e)
+        self.flush()
+
+    def _run(self):
+        while not self._stop.is_set():
+            url = self.url_provider()
+            if url:
+                self.record(url)
+            self._stop.wait(self.retry_delay)
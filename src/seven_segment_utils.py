@@ -14,7 +14,7 @@ class Segment(str, Enum):
     G = "g"  # Middle
 
 
-@dataclass
+@dataclass(slots=True)
 class SegmentLocation:
     """Location of a segment in the display data"""
 
@@ -22,9 +22,26 @@ class SegmentLocation:
     bit: int  # Which bit in the byte (0-7)
 
 
+# Segments lit for each decimal digit
+DIGIT_TO_SEGMENTS = {
+    0: [Segment.A, Segment.B, Segment.C, Segment.D, Segment.E, Segment.F],
+    1: [Segment.B, Segment.C],
+    2: [Segment.A, Segment.B, Segment.D, Segment.E, Segment.G],
+    3: [Segment.A, Segment.B, Segment.C, Segment.D, Segment.G],
+    4: [Segment.B, Segment.C, Segment.F, Segment.G],
+    5: [Segment.A, Segment.C, Segment.D, Segment.F, Segment.G],
+    6: [Segment.A, Segment.C, Segment.D, Segment.E, Segment.F, Segment.G],
+    7: [Segment.A, Segment.B, Segment.C],
+    8: [Segment.A, Segment.B, Segment.C, Segment.D, Segment.E, Segment.F, Segment.G],
+    9: [Segment.A, Segment.B, Segment.C, Segment.D, Segment.F, Segment.G],
+}
+
+
 class Digit:
     """Represents a digit position (hours tens, hours ones, etc)"""
 
+    __slots__ = ("segments",)
+
     def __init__(self, segment_map: dict[Segment, SegmentLocation]):
         self.segments = segment_map
 
@@ -39,19 +56,6 @@ class Digit:
         Returns:
             List of Segments that should be lit
         """
-        DIGIT_TO_SEGMENTS = {
-            0: [Segment.A, Segment.B, Segment.C, Segment.D, Segment.E, Segment.F],
-            1: [Segment.B, Segment.C],
-            2: [Segment.A, Segment.B, Segment.D, Segment.E, Segment.G],
-            3: [Segment.A, Segment.B, Segment.C, Segment.D, Segment.G],
-            4: [Segment.B, Segment.C, Segment.F, Segment.G],
-            5: [Segment.A, Segment.C, Segment.D, Segment.F, Segment.G],
-            6: [Segment.A, Segment.C, Segment.D, Segment.E, Segment.F, Segment.G],
-            7: [Segment.A, Segment.B, Segment.C],
-            8: [Segment.A, Segment.B, Segment.C, Segment.D, Segment.E, Segment.F, Segment.G],
-            9: [Segment.A, Segment.B, Segment.C, Segment.D, Segment.F, Segment.G],
-        }
-
         if not 0 <= digit <= 9:
             raise ValueError("Digit must be between 0 and 9")
 
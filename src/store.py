@@ -0,0 +1,201 @@
+from pathlib import Path
+from typing import Any
+import json
+import logging
+import os
+import threading
+import zlib
+
+log = logging.getLogger(__name__)
+
+STATE_PATH = Path(os.environ.get("TICKI_STATE_PATH", Path.home() / ".local/share/ticki/state.log"))
+
+# Seconds changes are collected before they are written together
+FLUSH_DELAY = 1.0
+
+
+def encode_record(key: str, value: Any) -> bytes:
+    """One log line: CRC32 of the JSON payload, a space and the payload."""
+    payload = json.dumps({"k": key, "v": value}, separators=(",", ":")).encode()
+    return b"%08x %s\n" % (zlib.crc32(payload), payload)
+
+
+def decode_record(line: bytes) -> tuple[str, Any]:
+    checksum, _, payload = line.rstrip(b"\n").partition(b" ")
+    if not line.endswith(b"\n") or int(checksum, 16) != zlib.crc32(payload):
+        raise ValueError("Corrupt record")
+    record = json.loads(payload)
+    return record["k"], record["v"]
+
+
+class StateStore:
+    """Key-value state persisted in an append-only, checksummed log
+
+    Changes are collected for `flush_delay` seconds and appended with a single
+    write and fsync, so a burst of edits costs one flash write. A value of None
+    deletes a key. Once the log holds mostly outdated records it is compacted:
+    the current state is written to a new file that atomically replaces the log.
+
+    On load, records are replayed up to the first one that is truncated or fails
+    its checksum (e.g. power loss during a write); the rest is discarded.
+    """
+
+    def __init__(
+        self,
+        path: Path = STATE_PATH,
+        flush_delay: float = FLUSH_DELAY,
+        compact_ratio: int = 4,
+        min_compact_records: int = 64,
+    ):
+        self.path = Path(path)
+        self.flush_delay = flush_delay
+        self.compact_ratio = compact_ratio
+        self.min_compact_records = min_compact_records
+        self.stats = {
+            "changes": 0,
+            "records": 0,
+            "bytes": 0,
+            "fsyncs": 0,
+            "compactions": 0,
+            "discarded_bytes": 0,
+        }
+        self._state: dict[str, Any] = {}
+        self._pending: dict[str, Any] = {}
+        self._log_records = 0
+        self._log_broken = False
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    def load(self) -> dict[str, Any]:
+        """Replay the log and start the writer; returns the restored state."""
+        try:
+            data = self.path.read_bytes()
+        except FileNotFoundError:
+            data = b""
+
+        valid = 0
+        for line in data.splitlines(keepends=True):
+            try:
+                key, value = decode_record(line)
+            except (ValueError, KeyError, TypeError):
+                break
+            self._apply(self._state, key, value)
+            self._log_records += 1
+            valid += len(line)
+
+        if valid < len(data):
+            self.stats["discarded_bytes"] = len(data) - valid
+            log.warning("Discarding %d corrupt bytes of %s", len(data) - valid, self.path)
+            self._log_broken = True
+            self.flush()
+
+        self._thread = threading.Thread(target=self._run, name="state-store", daemon=True)
+        self._thread.start()
+        return dict(self._state)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._condition:
+            if key in self._pending:
+                value = self._pending[key]
+                return default if value is None else value
+            return self._state.get(key, default)
+
+    def set(self, key: str, value: Any):
+        with self._condition:
+            self._pending[key] = value
+            self.stats["changes"] += 1
+            self._condition.notify_all()
+
+    def delete(self, key: str):
+        self.set(key, None)
+
+    def flush(self):
+        """Write pending changes now."""
+        with self._write_lock:
+            with self._condition:
+                changes = {
+                    key: value
+                    for key, value in self._pending.items()
+                    if self._state.get(key) != value
+                }
+                self._pending = {}
+                for key, value in changes.items():
+                    self._apply(self._state, key, value)
+                snapshot = dict(self._state)
+
+            # The disk is written without holding the condition, so set() never waits for it
+            try:
+                if self._log_broken:
+                    self._compact(snapshot)
+                elif changes:
+                    self._append(changes)
+                    if self._log_records > max(
+                        self.min_compact_records, self.compact_ratio * len(snapshot)
+                    ):
+                        self._compact(snapshot)
+            except OSError as e:
+                log.error("Failed to save state: %s", e)
+                # The log may end in a partial record: rewrite it from the full state next time
+                self._log_broken = True
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread:
+            self._thread.join()
+        self.flush()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._closed)
+                if self._closed:
+                    return
+                # Let a burst of changes collect before writing them
+                self._condition.wait_for(lambda: self._closed, self.flush_delay)
+            self.flush()
+
+    def _append(self, changes: dict[str, Any]):
+        records = b"".join(encode_record(key, value) for key, value in changes.items())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            f.write(records)
+            f.flush()
+            os.fsync(f.fileno())
+        self.stats["records"] += len(changes)
+        self.stats["bytes"] += len(records)
+        self.stats["fsyncs"] += 1
+        self._log_records += len(changes)
+
+    def _compact(self, state: dict[str, Any]):
+        """Atomically replace the log with one record per live key."""
+        records = b"".join(encode_record(key, value) for key, value in state.items())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(records)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        # Make the rename itself durable
+        directory = os.open(self.path.parent, os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+        self.stats["records"] += len(state)
+        self.stats["bytes"] += len(records)
+        self.stats["fsyncs"] += 2
+        self.stats["compactions"] += 1
+        self._log_records = len(state)
+        self._log_broken = False
+
+    @staticmethod
+    def _apply(state: dict[str, Any], key: str, value: Any):
+        if value is None:
+            state.pop(key, None)
+        else:
+            state[key] = value
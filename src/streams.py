@@ -0,0 +1,137 @@
+from dataclasses import dataclass, field
+from typing import Callable, Iterable
+from urllib.parse import urlparse
+import logging
+import threading
+import time
+from .netio import http_get
+from . import metrics
+
+log = logging.getLogger(__name__)
+
+PLAYLIST_SUFFIXES = (".m3u", ".pls")
+
+RESOLVE = metrics.histogram(
+    "ticki_stream_resolve_seconds", "Time to fetch and parse a station playlist", slow=2.0
+)
+RESOLVE_FAILURES = metrics.counter(
+    "ticki_stream_resolve_failures_total", "Playlists that could not be fetched"
+)
+
+
+def is_playlist(url: str) -> bool:
+    return urlparse(url).path.lower().endswith(PLAYLIST_SUFFIXES)
+
+
+def parse_playlist(text: str) -> list[str]:
+    """Return the stream URLs of an M3U or PLS playlist, in playlist order."""
+    urls = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or line.startswith("["):
+            continue
+
+        if "=" in line and line.lower().startswith("file"):
+            # PLS: File1=http://...
+            urls.append(line.split("=", 1)[1].strip())
+        elif "://" in line:
+            # M3U: one URL per line (PLS keys like Title1= or NumberOfEntries= are skipped)
+            urls.append(line)
+    return urls
+
+
+@dataclass(slots=True)
+class _Entry:
+    urls: list[str]
+    resolved_at: float
+    dead: set[str] = field(default_factory=set)
+
+
+class StreamResolver:
+    """Resolves station URLs (following M3U/PLS playlists) and caches the result
+
+    Playlists are refreshed after ttl seconds. When a stream URL turns out to be
+    dead, failover() moves on to the next entry of the playlist.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], str] = lambda url: http_get(url).text,
+        ttl: float = 6 * 60 * 60,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def get_stream_url(self, station_url: str) -> str | None:
+        """The first live stream URL for a station, resolving its playlist if needed."""
+        entry = self._entry(station_url)
+        if entry is None:
+            return None
+
+        with self._lock:
+            live = [url for url in entry.urls if url not in entry.dead]
+            return live[0] if live else None
+
+    def failover(self, station_url: str, failed_url: str) -> str | None:
+        """Mark failed_url as dead and return the next stream URL of the station, if any."""
+        with self._lock:
+            entry = self._entries.get(station_url)
+            if entry:
+                entry.dead.add(failed_url)
+                if all(url in entry.dead for url in entry.urls):
+                    # Every entry failed: start over with a fresh playlist next time
+                    del self._entries[station_url]
+                    return None
+        return self.get_stream_url(station_url)
+
+    def prefetch(self, station_urls: Iterable[str]):
+        """Resolve all stations in the background and keep them fresh."""
+        station_urls = list(station_urls)
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(station_urls,), name="stream-prefetch", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self, station_urls: list[str]):
+        while not self._stop.is_set():
+            for station_url in station_urls:
+                self._entry(station_url)
+            self._stop.wait(self.ttl)
+
+    def _entry(self, station_url: str) -> _Entry | None:
+        with self._lock:
+            entry = self._entries.get(station_url)
+        if entry and self.clock() - entry.resolved_at < self.ttl:
+            return entry
+
+        if not is_playlist(station_url):
+            urls = [station_url]
+        else:
+            try:
+                with RESOLVE.time():
+                    urls = parse_playlist(self.fetch(station_url))
+            except Exception as e:
+                RESOLVE_FAILURES.inc()
+                log.warning("Error fetching playlist %s: %s", station_url, e)
+                # Serve a stale playlist rather than nothing
+                return entry
+            if not urls:
+                log.warning("Playlist %s has no entries", station_url)
+                return entry
+
+        entry = _Entry(urls, self.clock())
+        with self._lock:
+            self._entries[station_url] = entry
+        return entry
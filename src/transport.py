@@ -0,0 +1,148 @@
+from abc import ABC, abstractmethod
+from functools import cache
+import logging
+import os
+import time
+
+log = logging.getLogger(__name__)
+
+
+@cache
+def gpio():
+    """The board and digitalio modules, or mock hardware when not running on a Raspberry Pi."""
+    try:
+        import board
+        import digitalio
+    except (ImportError, NotImplementedError):
+        from . import mock_hardware as digitalio
+
+        board = digitalio.board
+        log.info("Running with mock hardware (development mode)")
+    return board, digitalio
+
+
+class Transport(ABC):
+    """Moves frames and raw pin states from the Projector to the hardware"""
+
+    # Whether set_pins() can drive MOSI/CLK/EN individually (needed for CSV replay)
+    supports_pins = True
+
+    @abstractmethod
+    def write_frame(self, frame: int, num_bits: int):
+        """Send the lowest num_bits of frame, MSB first, framed by EN low."""
+
+    @abstractmethod
+    def set_pins(self, mosi: bool, clk: bool, en: bool):
+        """Drive the three protocol lines directly."""
+
+    def idle(self):
+        """Return all lines to their idle (high) state."""
+        self.set_pins(True, True, True)
+
+    def close(self):
+        """Release the underlying hardware."""
+
+
+class BitbangTransport(Transport):
+    """Toggles the GPIO pins one bit at a time"""
+
+    def __init__(self, sck=None, mosi=None, enable=None):
+        """Drive the SPI0 pins, or the given pin objects (e.g. from a PinRecorder)."""
+        board, digitalio = gpio()
+        self.sck = sck or digitalio.DigitalInOut(board.SCK)
+        self.mosi = mosi or digitalio.DigitalInOut(board.MOSI)
+        self.enable = enable or digitalio.DigitalInOut(board.CE0)
+        self.sck.direction = digitalio.Direction.OUTPUT
+        self.mosi.direction = digitalio.Direction.OUTPUT
+        self.enable.direction = digitalio.Direction.OUTPUT
+
+    def write_frame(self, frame: int, num_bits: int):
+        self.enable.value = False
+        time.sleep(0.0000005)
+        for shift in range(num_bits - 1, -1, -1):
+            self.mosi.value = bool((frame >> shift) & 1)
+            self.sck.value = False
+            time.sleep(0.000000001)
+            self.sck.value = True
+            time.sleep(0.000001)
+        self.mosi.value = True
+        time.sleep(0.000001)
+        self.enable.value = True
+        time.sleep(0.000001)
+
+    def set_pins(self, mosi: bool, clk: bool, en: bool):
+        self.mosi.value = mosi
+        self.sck.value = clk
+        self.enable.value = en
+
+
+class SpiTransport(Transport):
+    """Sends each frame in a single transfer over the hardware SPI peripheral
+
+    The SPI driver owns SCK/MOSI/CE0, so raw pin replay is not available.
+    """
+
+    supports_pins = False
+
+    def __init__(self, bus: int = 0, device: int = 0, speed_hz: int = 50_000):
+        import spidev
+
+        self.spi = spidev.SpiDev()
+        self.spi.open(bus, device)
+        # Clock idles high and data is sampled on the rising edge
+        self.spi.mode = 0b11
+        self.spi.max_speed_hz = speed_hz
+
+    @staticmethod
+    def frame_to_bytes(frame: int, num_bits: int) -> bytes:
+        """
+        Left-pad a frame with idle-high bits up to a whole number of bytes.
+
+        The projector latches the last bits clocked in before EN rises, so the
+        leading padding bits have the same effect as the (also high) prefix bit.
+        """
+        padding = -num_bits % 8
+        padded = (((1 << padding) - 1) << num_bits) | (frame & ((1 << num_bits) - 1))
+        return padded.to_bytes((num_bits + padding) // 8, "big")
+
+    def write_frame(self, frame: int, num_bits: int):
+        self.spi.writebytes2(self.frame_to_bytes(frame, num_bits))
+
+    def set_pins(self, mosi: bool, clk: bool, en: bool):
+        raise NotImplementedError("SPI transport cannot drive pins directly")
+
+    def idle(self):
+        pass
+
+    def close(self):
+        self.spi.close()
+
+
+class RecordingTransport(Transport):
+    """Records frames and pin states instead of driving hardware (for tests)"""
+
+    def __init__(self):
+        self.frames: list[tuple[int, int]] = []
+        self.pin_states: list[tuple[bool, bool, bool]] = []
+
+    def write_frame(self, frame: int, num_bits: int):
+        self.frames.append((frame, num_bits))
+
+    def set_pins(self, mosi: bool, clk: bool, en: bool):
+        self.pin_states.append((mosi, clk, en))
+
+
+TRANSPORTS: dict[str, type[Transport]] = {
+    "bitbang": BitbangTransport,
+    "spi": SpiTransport,
+    "recording": RecordingTransport,
+}
+
+
+def create_transport(name: str | None = None) -> Transport:
+    """Create the transport named by name or $TICKI_PROJECTOR_TRANSPORT (default: bitbang)."""
+    name = name or os.environ.get("TICKI_PROJECTOR_TRANSPORT", "bitbang")
+    if name not in TRANSPORTS:
+        raise ValueError(f"Unknown projector transport: {name}")
+
+    return TRANSPORTS[name]()
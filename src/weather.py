@@ -1,10 +1,24 @@
 from __future__ import annotations
-from dataclasses import dataclass
-import python_weather
-import asyncio
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+import json
+import logging
+import os
+import threading
+import time
+from .netio import aiohttp_session, run_coroutine
+from . import metrics
 
+log = logging.getLogger(__name__)
 
-@dataclass
+FETCH = metrics.histogram("ticki_weather_fetch_seconds", "Time to fetch the forecast", slow=5.0)
+FETCH_FAILURES = metrics.counter("ticki_weather_fetch_failures_total", "Failed forecast fetches")
+
+CACHE_PATH = Path.home() / ".cache" / "ticki" / "weather.json"
+
+
+@dataclass(slots=True)
 class Weather:
     """Weather data to display on the OLED screen"""
 
@@ -18,23 +32,126 @@ class Weather:
     @staticmethod
     async def _fetch_weather() -> Weather:
         """Internal async method to fetch weather data"""
-        async with python_weather.Client(unit=python_weather.METRIC) as client:
-            # Hardcoded for Zürich
-            weather = await client.get("Hamburg")
+        import python_weather
 
-            # Get today's forecast
-            today = next(iter(weather))
+        # The shared session is owned by netio, so the client is not closed here
+        client = python_weather.Client(unit=python_weather.METRIC, session=await aiohttp_session())
+        # Hardcoded for Zürich
+        weather = await client.get("Hamburg")
 
-            return Weather(
-                min_temperature=today.lowest_temperature, max_temperature=today.highest_temperature
-            )
+        # Get today's forecast
+        today = next(iter(weather))
+
+        return Weather(
+            min_temperature=today.lowest_temperature, max_temperature=today.highest_temperature
+        )
 
     @classmethod
-    def get_weather(cls) -> "Weather":
-        """Get weather data for Zürich"""
+    def fetch_weather(cls) -> "Weather":
+        """Get weather data for Zürich, raising if the fetch fails"""
+        return run_coroutine(cls._fetch_weather())
+
+
+class WeatherService:
+    """Keeps the weather up to date in the background
+
+    The last forecast is cached on disk so it can be shown right after a restart.
+    Stale data keeps being served while a refresh is in flight, and failed
+    refreshes are retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        on_update: Callable[[Weather], None],
+        provider: Callable[[], Weather] = Weather.fetch_weather,
+        cache_path: Path = CACHE_PATH,
+        ttl: float = 30 * 60,
+        min_backoff: float = 30,
+        max_backoff: float = 30 * 60,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.on_update = on_update
+        self.provider = provider
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+
+        self.weather: Weather | None = None
+        self.fetched_at: float | None = None
+        self.failures = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self):
+        """Publish the cached forecast (if any) and start refreshing in the background."""
+        self._load_cache()
+        if self.weather:
+            self._publish(self.weather)
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="weather", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def is_stale(self) -> bool:
+        if self.fetched_at is None:
+            return True
+
+        # A negative age means the clock was behind (no RTC before NTP sync), so don't trust it
+        age = self.clock() - self.fetched_at
+        return age < 0 or age >= self.ttl
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._stop.wait(self._step())
+
+    def _step(self) -> float:
+        """Refresh if the cache is stale and return the number of seconds until the next check."""
+        if not self.is_stale():
+            return self.ttl - (self.clock() - self.fetched_at)
+
         try:
-            return asyncio.run(cls._fetch_weather())
+            with FETCH.time():
+                weather = self.provider()
         except Exception as e:
-            # Fallback values if weather fetch fails
-            print(f"Failed to fetch weather: {e}")
-            return Weather(min_temperature=0.0, max_temperature=0.0)
+            FETCH_FAILURES.inc()
+            self.failures += 1
+            backoff = min(self.min_backoff * 2 ** (self.failures - 1), self.max_backoff)
+            log.warning("Failed to fetch weather (retrying in %.0fs): %s", backoff, e)
+            return backoff
+
+        self.failures = 0
+        self.weather = weather
+        self.fetched_at = self.clock()
+        self._save_cache()
+        self._publish(weather)
+        return self.ttl
+
+    def _publish(self, weather: Weather):
+        try:
+            self.on_update(weather)
+        except Exception:
+            log.exception("Error publishing weather")
+
+    def _load_cache(self):
+        try:
+            data = json.loads(self.cache_path.read_text())
+            self.weather = Weather(data["min_temperature"], data["max_temperature"])
+            self.fetched_at = data["fetched_at"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def _save_cache(self):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps({**asdict(self.weather), "fetched_at": self.fetched_at}))
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            log.warning("Failed to cache weather: %s", e)
@@ -0,0 +1,62 @@
+from datetime import date, datetime
+
+from src.alarms import Alarm, AlarmSchedule, describe
+
+# A Wednesday
+NOW = datetime(2024, 1, 10, 22, 0)
+
+
+def test_next_occurrence_wraps_past_midnight():
+    assert Alarm("06:30", True).next_occurrence(NOW) == datetime(2024, 1, 11, 6, 30)
+    assert Alarm("23:00", True).next_occurrence(NOW) == datetime(2024, 1, 10, 23, 0)
+    assert Alarm("06:30", False).next_occurrence(NOW) is None
+    assert Alarm(None, True).next_occurrence(NOW) is None
+
+
+def test_recurrence():
+    weekend = Alarm("09:00", True, days=frozenset({5, 6}))
+    assert weekend.next_occurrence(NOW) == datetime(2024, 1, 13, 9, 0)
+
+    one_off = Alarm("09:00", True, on=date(2024, 1, 12))
+    assert one_off.next_occurrence(NOW) == datetime(2024, 1, 12, 9, 0)
+    assert one_off.next_occurrence(datetime(2024, 1, 12, 9, 0)) is None
+
+
+def test_schedule_orders_alarms_and_updates_incrementally():
+    schedule = AlarmSchedule()
+    assert schedule.next(NOW) is None
+
+    late = schedule.add(Alarm("23:30", True), NOW)
+    early = schedule.add(Alarm("23:00", True), NOW)
+    assert schedule.next(NOW) == (datetime(2024, 1, 10, 23, 0), early)
+
+    schedule.update(early, Alarm("23:00", False), NOW)
+    assert schedule.next(NOW) == (datetime(2024, 1, 10, 23, 30), late)
+
+    schedule.remove(late)
+    assert schedule.next(NOW) is None
+    assert len(schedule) == 1
+
+
+def test_passed_alarms_move_on_to_their_next_occurrence():
+    schedule = AlarmSchedule()
+    alarm_id = schedule.add(Alarm("23:00", True), NOW)
+
+    after = datetime(2024, 1, 10, 23, 0, 30)
+    assert schedule.next(after) == (datetime(2024, 1, 11, 23, 0), alarm_id)
+
+
+def test_skip_next():
+    schedule = AlarmSchedule()
+    weekly = schedule.add(Alarm("07:00", True, days=frozenset({0})), NOW)
+
+    assert schedule.skip_next(weekly, NOW) == datetime(2024, 1, 15, 7, 0)
+    assert schedule.next(NOW) == (datetime(2024, 1, 22, 7, 0), weekly)
+    # Once the skipped occurrence has passed, the alarm rings as usual again
+    assert schedule.next(datetime(2024, 1, 22, 8, 0)) == (datetime(2024, 1, 29, 7, 0), weekly)
+
+
+def test_describe():
+    assert describe(datetime(2024, 1, 11, 6, 30), NOW) == "06:30"
+    assert describe(datetime(2024, 1, 13, 9, 0), NOW) == "Sat 09:00"
+    assert describe(datetime(2024, 1, 22, 7, 0), NOW) == "22.01. 07:00"
@@ -0,0 +1,67 @@
+import threading
+from array import array
+from pathlib import Path
+
+from src.animation import AnimationPlayer, Timeline, compile_capture, load_timeline
+
+STARTUP_CSV = Path(__file__).parents[1] / "src" / "startup.csv"
+
+
+def test_compile_startup_capture():
+    timeline = compile_capture(STARTUP_CSV)
+
+    assert len(timeline) == 211
+    # First row: MOSI=0, CLK=0, EN=0; third row 10 µs later: MOSI=1, CLK=1, EN=0
+    assert timeline.delays_us[0] == 0 and timeline.states[0] == 0
+    assert timeline.delays_us[2] == 10 and timeline.states[2] == 0b011
+
+    restored, mtime_ns, size = Timeline.from_bytes(timeline.to_bytes(123, 456))
+    assert restored == timeline
+    assert (mtime_ns, size) == (123, 456)
+
+
+def test_load_timeline_uses_cache(tmp_path):
+    timeline = load_timeline(STARTUP_CSV, cache_dir=tmp_path)
+    cache_path = tmp_path / "startup.tka"
+    assert cache_path.exists()
+
+    # A stale cache (different source mtime) is recompiled
+    cache_path.write_bytes(timeline.to_bytes(0, 0))
+    assert load_timeline(STARTUP_CSV, cache_dir=tmp_path) == timeline
+    assert cache_path.read_bytes() != timeline.to_bytes(0, 0)
+
+
+def test_player_queues_and_cancels():
+    pins = []
+    lock = threading.Lock()
+    player = AnimationPlayer(lambda *state: pins.append(state), lock)
+    short = Timeline(array("I", [0, 10, 10]), b"\x07\x00\x07")
+
+    with lock:
+        # Hold the lock so that nothing starts playing while queueing
+        first = player.play(short)
+        cancelled = player.play(short)
+        cancelled.cancel()
+        last = player.play(short)
+
+    assert last.wait(timeout=5)
+    assert first.done.is_set() and cancelled.done.is_set()
+    assert len(pins) == 6
+    assert not cancelled.errors_us
+    assert first.timing_error()["max_us"] >= 0
+
+
+def test_stop_cancels_animations_and_ends_the_thread():
+    started = threading.Event()
+    player = AnimationPlayer(lambda *state: started.set(), threading.Lock())
+    # A 10 s pause between two steps
+    long = Timeline(array("I", [0, 10_000_000]), b"\x07\x00")
+
+    running = player.play(long)
+    queued = player.play(long)
+    assert started.wait(timeout=5)
+    player.stop(timeout=1)
+
+    assert not player._thread.is_alive()
+    assert running.done.is_set() and queued.done.is_set()
+    assert queued.cancelled.is_set()
@@ -0,0 +1,40 @@
+from datetime import datetime
+
+from src.clock import MinuteClock
+
+
+def test_ticks_on_minute_boundaries():
+    ticks = []
+    clock = MinuteClock(ticks.append, max_sleep=15.0)
+
+    # First step fires immediately and sleeps until (at most max_sleep before) the boundary
+    assert clock._step(datetime(2024, 1, 1, 7, 29, 50), 0.0) == 10.0
+    assert clock._step(datetime(2024, 1, 1, 7, 30, 0, 2000), 10.002) == 15.0
+    assert clock._step(datetime(2024, 1, 1, 7, 30, 15), 25.0) == 15.0
+
+    assert ticks == [datetime(2024, 1, 1, 7, 29, 50), datetime(2024, 1, 1, 7, 30, 0, 2000)]
+    assert clock.lag_stats()["last_lag"] == 0.002
+    assert clock.clock_jumps == 0
+
+
+def test_clock_jump_fires_immediately():
+    ticks = []
+    clock = MinuteClock(ticks.append)
+
+    clock._step(datetime(2024, 3, 31, 1, 59, 30), 0.0)
+    # DST switch: wall clock jumps an hour ahead after only 10 s of monotonic time
+    clock._step(datetime(2024, 3, 31, 3, 59, 40), 10.0)
+
+    assert len(ticks) == 2
+    assert clock.clock_jumps == 1
+    assert not clock.lags
+
+
+def test_subminute_ticks():
+    ticks = []
+    clock = MinuteClock(ticks.append)
+    clock.set_subminute_interval(1.0)
+
+    assert clock._step(datetime(2024, 1, 1, 7, 30, 10), 0.0) == 1.0
+    assert clock._step(datetime(2024, 1, 1, 7, 30, 11), 1.0) == 1.0
+    assert len(ticks) == 2
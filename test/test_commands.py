@@ -0,0 +1,91 @@
+import threading
+
+import pytest
+
+from src.commands import SUPERSEDED, CommandExecutor
+
+
+def test_commands_run_in_order_on_one_thread():
+    executor = CommandExecutor(coalesce_window=0)
+    threads = []
+    calls = []
+
+    def command(value):
+        threads.append(threading.current_thread().name)
+        calls.append(value)
+        return value * 2
+
+    futures = [executor.submit(command, i) for i in range(5)]
+    assert [future.result(timeout=5) for future in futures] == [0, 2, 4, 6, 8]
+    assert calls == [0, 1, 2, 3, 4]
+    assert set(threads) == {"commands"}
+    executor.stop()
+
+
+def test_rapid_commands_with_the_same_key_are_coalesced():
+    executor = CommandExecutor(coalesce_window=0.2)
+    calls = []
+
+    def set_station(name):
+        calls.append(name)
+        return name
+
+    futures = [executor.submit(set_station, name, key="station") for name in "abcde"]
+    # Every caller gets the result of the one command that ran
+    assert [future.result(timeout=5) for future in futures] == ["e"] * 5
+    assert calls == ["e"]
+    assert executor.executed == 1
+    assert executor.coalesced == 4
+    executor.stop()
+
+
+def test_exceptions_are_passed_to_the_caller():
+    executor = CommandExecutor(coalesce_window=0)
+
+    def fail():
+        raise ValueError("broken")
+
+    with pytest.raises(ValueError):
+        executor.submit(fail).result(timeout=5)
+    # The executor keeps running
+    assert executor.submit(lambda: 1).result(timeout=5) == 1
+    executor.stop()
+
+
+def test_stop_runs_queued_commands():
+    executor = CommandExecutor(coalesce_window=10)
+    future = executor.submit(lambda: "done", key="slow")
+    executor.stop(timeout=5)
+    assert future.result(timeout=0) == "done"
+    with pytest.raises(RuntimeError):
+        executor.submit(lambda: None)
+
+
+def test_a_replaced_different_command_is_superseded():
+    executor = CommandExecutor(coalesce_window=0.1)
+    play = executor.submit(lambda: "playing", key="playback")
+    stop = executor.submit(lambda: "stopped", key="playback")
+
+    assert play.result(timeout=5) is SUPERSEDED
+    assert not play.result()
+    assert stop.result(timeout=5) == "stopped"
+    executor.stop()
+
+
+def test_replacements_do_not_extend_the_window():
+    now = [0.0]
+    executor = CommandExecutor(coalesce_window=1, clock=lambda: now[0])
+
+    def set_station(name):
+        return name
+
+    first = executor.submit(set_station, "a", key="station")
+    now[0] = 0.9
+    executor.submit(set_station, "b", key="station")
+    now[0] = 1.0
+    # Nudge the executor so that it rechecks the head of the queue
+    with executor._condition:
+        executor._condition.notify_all()
+
+    assert first.result(timeout=5) == "b"
+    executor.stop()
@@ -0,0 +1,48 @@
+from pathlib import Path
+
+from src.decoder import Capture, Frame, analyze, decode
+from src.projector import CLOCK_FRAMES, FRAME_BITS, Projector
+from src.mock_hardware import PinRecorder
+
+STARTUP_CSV = Path(__file__).parents[1] / "src" / "startup.csv"
+
+
+def test_clock_frames_decode_to_their_time():
+    for hours in range(24):
+        for minutes in range(60):
+            frame = Frame(0.0, 0.0, FRAME_BITS, CLOCK_FRAMES[hours * 60 + minutes])
+            assert frame.clock_time == (hours, minutes)
+
+
+def test_decode_logic_analyzer_capture():
+    capture = Capture.from_csv(STARTUP_CSV)
+    frames = decode(capture)
+
+    assert [frame.bits for frame in frames] == [13, 12, 12, 12, FRAME_BITS]
+    # The startup animation ends with every segment lit
+    assert frames[-1].clock_time == (18, 88)
+
+    report = analyze(capture)
+    assert report.frames == 5
+    assert 5000 < report.bit_rate < 6500
+    assert report.violations(min_setup=50e-6, min_hold=10e-6, min_gap=200e-6) == []
+    assert report.violations(min_setup=100e-6, min_hold=0, min_gap=0) == [
+        "setup 60.0 us < 100.0 us"
+    ]
+
+
+def test_decode_projector_output(tmp_path):
+    recorder = PinRecorder()
+    projector = Projector(recorder.transport(), cache_dir=tmp_path)
+    projector.startup.cancel()
+    projector.startup.wait()
+    recorder.samples.clear()
+
+    projector.send_time(12, 34)
+    projector.send_time(7, 5)
+
+    capture = Capture.from_recorder(recorder)
+    assert [frame.clock_time for frame in decode(capture)] == [(12, 34), (7, 5)]
+    report = analyze(capture)
+    assert report.frames == 2
+    assert report.min_setup > 0 and report.min_hold > 0 and report.min_gap > 0
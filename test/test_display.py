@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from luma.core.device import dummy
+from luma.core.render import canvas
+from PIL import ImageChops
+
+from src.display import Display
+from src.weather import Weather
+
+
+def test_cached_rendering_matches_canvas():
+    device = dummy(width=128, height=64, mode="1")
+    display = Display(device)
+    display.update_time(datetime(2024, 1, 1, 7, 5), "06:45")
+    display.update_weather(Weather(3.2, 11.0))
+    assert display.wait_idle(timeout=5)
+
+    reference = dummy(width=128, height=64, mode="1")
+    with canvas(reference) as draw:
+        draw.text((0, 0), "7:05", fill="white", font_size=22)
+        draw.text((0, 24), "Alarm: 06:45", fill="white", font_size=16)
+        draw.text((0, 40), "3.2°C to 11°C", fill="white", font_size=16)
+
+    assert ImageChops.difference(device.image, reference.image).getbbox() is None
+
+
+def test_text_runs_are_cached():
+    display = Display(dummy(width=128, height=64, mode="1"))
+    for minute in (0, 1, 0, 1):
+        display.update_time(datetime(2024, 1, 1, 7, minute))
+
+    # "7:00", "7:01", "No alarm set" and "Weather n/a" are each rasterized once
+    assert display.text_cache.misses == 5
+    assert display.text_cache.hits > 0
@@ -0,0 +1,57 @@
+import json
+
+from src.events import StateBroadcaster
+
+
+def read(stream) -> tuple[int, dict]:
+    event = next(stream)
+    id_line, data_line = event.strip().split("\n")
+    return int(id_line.removeprefix("id: ")), json.loads(data_line.removeprefix("data: "))
+
+
+def test_clients_receive_full_state_then_deltas():
+    broadcaster = StateBroadcaster()
+    broadcaster.publish({"playing": False, "station": "srf2"})
+
+    subscription = broadcaster.subscribe()
+    stream = broadcaster.stream(subscription, heartbeat=0.01, duration=5)
+    assert read(stream) == (1, {"playing": False, "station": "srf2"})
+
+    broadcaster.publish({"playing": True, "station": "srf2"})
+    # Unchanged state is not sent again
+    broadcaster.publish({"playing": True, "station": "srf2"})
+    assert read(stream) == (2, {"playing": True})
+
+    assert next(stream) == ": ping\n\n"
+    stream.close()
+    assert broadcaster._subscribers == []
+
+
+def test_client_limit_and_overflow():
+    broadcaster = StateBroadcaster(max_clients=1, queue_size=2)
+    subscription = broadcaster.subscribe()
+    assert broadcaster.subscribe() is None
+
+    for volume in range(5):
+        broadcaster.publish({"volume": volume})
+
+    # The backlog no longer fits, so the client gets the latest full state instead
+    stream = broadcaster.stream(subscription, duration=5)
+    assert read(stream) == (5, {"volume": 4})
+
+
+def test_snapshot_is_replaced_only_on_change():
+    broadcaster = StateBroadcaster()
+    broadcaster.publish({"playing": False, "station": "srf2"})
+    first = broadcaster.snapshot
+
+    broadcaster.publish({"playing": False, "station": "srf2"})
+    assert broadcaster.snapshot is first
+    assert json.loads(first.body) == {"version": 1, "playing": False, "station": "srf2"}
+
+    broadcaster.publish({"playing": True, "station": "srf2"})
+    assert broadcaster.snapshot.version == 2
+    assert broadcaster.snapshot.etag != first.etag
+    assert first.state["playing"] is False
+    # Tags of an earlier run don't match after a restart
+    assert StateBroadcaster().snapshot.etag != StateBroadcaster().snapshot.etag
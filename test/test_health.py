@@ -0,0 +1,141 @@
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.health import StreamMonitor
+
+
+class StreamingPlayer:
+    """Plays an HTTP stream like VLC would, reporting buffering, end and errors to a listener"""
+
+    def __init__(self, url: str, listener):
+        self.url = url
+        self.listener = listener
+        self._thread: threading.Thread | None = None
+
+    def play(self) -> bool:
+        self._thread = threading.Thread(target=self._read, daemon=True)
+        self._thread.start()
+        return True
+
+    def _read(self):
+        self.listener("buffering", 0.0)
+        try:
+            with urllib.request.urlopen(self.url, timeout=5) as response:
+                buffered = False
+                while response.read(1024):
+                    if not buffered:
+                        self.listener("buffering", 100.0)
+                        buffered = True
+        except OSError:
+            self.listener("error")
+            return
+        self.listener("end")
+
+
+def serve_stream(cut_after: int):
+    """A station that cuts the first connection after cut_after bytes and then stays up."""
+    done = threading.Event()
+
+    class Handler(BaseHTTPRequestHandler):
+        requests = 0
+
+        def do_GET(self):
+            Handler.requests += 1
+            self.send_response(200)
+            self.send_header("Content-Type", "audio/mpeg")
+            self.end_headers()
+            if Handler.requests == 1:
+                self.wfile.write(b"\xff\xfb" * (cut_after // 2))
+                return
+            while not done.is_set():
+                self.wfile.write(b"\xff\xfb" * 512)
+                done.wait(0.01)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, Handler, done
+
+
+def test_reconnects_after_the_server_cuts_the_stream():
+    server, handler, done = serve_stream(cut_after=8192)
+    url = f"http://127.0.0.1:{server.server_port}/stream.mp3"
+    attempts = []
+
+    def reconnect(attempt):
+        attempts.append(attempt)
+        return player.play()
+
+    monitor = StreamMonitor(reconnect, min_backoff=0.01, recovery_timeout=5)
+    player = StreamingPlayer(url, monitor.on_player_event)
+    monitor.start()
+    monitor.arm()
+    try:
+        player.play()
+        for _ in range(500):
+            if monitor.stats["reconnects"]:
+                break
+            done.wait(0.01)
+    finally:
+        monitor.disarm()
+        monitor.stop()
+        done.set()
+        server.shutdown()
+        server.server_close()
+
+    assert attempts == [0]
+    assert handler.requests == 2
+    assert monitor.stats["drops"] == 1
+    assert monitor.stats["reconnects"] == 1
+    assert 0 < monitor.stats["last_reconnect_seconds"] < 5
+
+
+def test_failed_reconnects_back_off_until_the_stream_buffers():
+    attempts = []
+
+    def reconnect(attempt):
+        attempts.append(attempt)
+        if attempt < 2:
+            return False
+        monitor.on_player_event("buffering", 100.0)
+        return True
+
+    monitor = StreamMonitor(reconnect, min_backoff=0.001, recovery_timeout=1)
+    monitor.start()
+    monitor.arm()
+    monitor.on_player_event("error")
+    try:
+        for _ in range(500):
+            if monitor.stats["reconnects"]:
+                break
+            threading.Event().wait(0.01)
+    finally:
+        monitor.stop()
+
+    assert attempts == [0, 1, 2]
+    assert monitor.stats["failed_reconnects"] == 2
+    assert monitor.stats["reconnects"] == 1
+
+
+def test_underruns_are_counted_and_timed():
+    now = [0.0]
+    monitor = StreamMonitor(lambda attempt: True, clock=lambda: now[0])
+
+    monitor.on_player_event("buffering", 20.0)
+    monitor.arm()
+    monitor.on_player_event("buffering", 0.0)
+    now[0] = 3.0
+    monitor.on_player_event("buffering", 100.0)
+    monitor.on_player_event("buffering", 20.0)
+    now[0] = 4.5
+    monitor.on_player_event("buffering", 60.0)
+    now[0] = 5.0
+    monitor.on_player_event("buffering", 100.0)
+
+    # Events before arming and the initial fill are ignored; one underrun lasted two seconds
+    assert monitor.stats["stalls"] == 1
+    assert monitor.stats["underrun_seconds"] == 2.0
+    assert monitor.stats["drops"] == 0
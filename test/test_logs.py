@@ -0,0 +1,70 @@
+import io
+import logging
+
+from src.logs import LogPipeline, RateLimiter, parse_levels
+
+
+def make_logger(pipeline: LogPipeline, name: str = "test.logs") -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.handlers = [pipeline.handler]
+    return logger
+
+
+def test_records_are_written_in_batches_and_kept():
+    stream = io.StringIO()
+    pipeline = LogPipeline(stream, capacity=3, batch_delay=10)
+    logger = make_logger(pipeline)
+    pipeline.start()
+    for i in range(5):
+        logger.info("Tick %d", i)
+    logger.warning("Stream dropped")
+    pipeline.stop()
+
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == "INFO test.logs: Tick 0"
+    assert lines[-1] == "WARNING test.logs: Stream dropped"
+    # All records waited for one batch
+    assert pipeline.writes == 1
+    assert [record["message"] for record in pipeline.records()] == [
+        "Tick 3",
+        "Tick 4",
+        "Stream dropped",
+    ]
+    assert [record["message"] for record in pipeline.records(level=logging.WARNING)] == [
+        "Stream dropped"
+    ]
+
+
+def test_repeated_messages_are_rate_limited():
+    now = [0.0]
+    limiter = RateLimiter(burst=2, period=60, clock=lambda: now[0])
+    stream = io.StringIO()
+    pipeline = LogPipeline(stream, limiter=limiter)
+    logger = make_logger(pipeline, "test.rate")
+    pipeline.start()
+    for minute in range(5):
+        logger.info("Tick at %d", minute)
+    logger.info("Something else")
+    pipeline.stop()
+    now[0] = 61.0
+    pipeline.start()
+    logger.info("Tick at %d", 61)
+    pipeline.stop()
+
+    assert stream.getvalue().splitlines() == [
+        "INFO test.rate: Tick at 0",
+        "INFO test.rate: Tick at 1",
+        "INFO test.rate: Something else",
+        "INFO test.rate: Tick at 61 (3 similar messages suppressed)",
+    ]
+    assert limiter.suppressed == 3
+
+
+def test_parse_levels():
+    assert parse_levels("INFO, src.clock=warning,src.streams=DEBUG,") == {
+        "": "INFO",
+        "src.clock": "WARNING",
+        "src.streams": "DEBUG",
+    }
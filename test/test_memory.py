@@ -0,0 +1,75 @@
+import subprocess
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+
+from luma.core.device import dummy
+
+from src import memory
+from src.display import Display
+from src.projector import Projector
+from src.radio import Radio
+from src.store import StateStore
+from src.transport import RecordingTransport
+
+# Allowed growth of traced memory over a second run of the steady-state workload
+STEADY_STATE_BUDGET = 64 * 1024
+
+HEAVY_MODULES = ("vlc", "luma", "PIL", "requests", "aiohttp", "python_weather", "numpy")
+
+
+def test_heavy_modules_are_imported_on_first_use():
+    code = "import sys, src.radio; print(' '.join(sys.modules))"
+    modules = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.split()
+
+    assert not {module.split(".")[0] for module in modules} & set(HEAVY_MODULES)
+    assert "unittest" not in modules
+
+
+def test_report_attributes_allocations_to_subsystems():
+    tracemalloc.start()
+    try:
+        display = Display(dummy(width=128, height=64, mode="1"))
+        display.wait_idle(timeout=5)
+        report = memory.report()
+    finally:
+        tracemalloc.stop()
+
+    assert report["rss_bytes"] > 0
+    assert report["traced_bytes"] > 0
+    assert "display" in report["subsystems"]
+
+
+def test_steady_state_memory_stays_within_budget(tmp_path):
+    radio = Radio(store=StateStore(tmp_path / "state.log"))
+    radio.commands.coalesce_window = 0
+    transport = RecordingTransport()
+    radio.projector = Projector(transport, cache_dir=tmp_path)
+    radio.projector.startup.cancel()
+    radio.display = Display(dummy(width=128, height=64, mode="1"))
+    alarm_id = radio.add_alarm().result()
+    start = datetime(2024, 1, 1)
+
+    def workload():
+        # Half a day of minute ticks, with an alarm change every hour
+        for minute in range(12 * 60):
+            radio._update_time(start + timedelta(minutes=minute))
+            transport.frames.clear()
+            if minute % 60 == 0:
+                radio.set_alarm(f"{minute // 60:02d}:30", True, alarm_id).result()
+        radio.display.wait_idle(timeout=5)
+
+    tracemalloc.start()
+    try:
+        workload()
+        before = tracemalloc.take_snapshot()
+        workload()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+        radio.cleanup()
+
+    growth = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    assert growth < STEADY_STATE_BUDGET, after.compare_to(before, "lineno")[:5]
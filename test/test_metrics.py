@@ -0,0 +1,47 @@
+from src.metrics import Registry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    histogram = registry.histogram("ticki_test_seconds", "Test latency")
+    for seconds in (0.0002, 0.003, 0.003, 20):
+        histogram.observe(seconds)
+
+    lines = registry.render().splitlines()
+    assert lines[:2] == [
+        "# HELP ticki_test_seconds Test latency",
+        "# TYPE ticki_test_seconds histogram",
+    ]
+    assert 'ticki_test_seconds_bucket{le="0.0005"} 1' in lines
+    assert 'ticki_test_seconds_bucket{le="0.0025"} 1' in lines
+    assert 'ticki_test_seconds_bucket{le="0.005"} 3' in lines
+    assert 'ticki_test_seconds_bucket{le="10.0"} 3' in lines
+    assert 'ticki_test_seconds_bucket{le="+Inf"} 4' in lines
+    assert "ticki_test_seconds_count 4" in lines
+
+
+def test_labels_and_counters():
+    registry = Registry()
+    assert registry.counter("ticki_test_total", "Test", kind="a") is registry.counter(
+        "ticki_test_total", "Test", kind="a"
+    )
+    registry.counter("ticki_test_total", "Test", kind="a").inc()
+    registry.counter("ticki_test_total", "Test", kind="b").inc(2)
+
+    text = registry.render()
+    assert text.count("# TYPE ticki_test_total counter") == 1
+    assert 'ticki_test_total{kind="a"} 1' in text
+    assert 'ticki_test_total{kind="b"} 2' in text
+
+
+def test_slow_events_are_kept_in_a_ring_buffer():
+    registry = Registry(slow_events=2)
+    histogram = registry.histogram("ticki_test_seconds", "Test", slow=0.1, endpoint="play")
+    with histogram.time():
+        pass
+    for seconds in (0.2, 0.3, 0.4):
+        histogram.observe(seconds)
+
+    assert [event["seconds"] for event in registry.slow_events] == [0.3, 0.4]
+    assert registry.slow_events[0]["labels"] == {"endpoint": "play"}
+    assert histogram.count == 4
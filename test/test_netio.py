@@ -0,0 +1,64 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src import netio
+from src.netio import aiohttp_session, get_io_loop, http_get, run_coroutine
+
+
+def test_run_coroutine_reuses_loop():
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    assert run_coroutine(current_loop()) is run_coroutine(current_loop())
+    assert run_coroutine(current_loop()) is get_io_loop().loop
+
+
+def test_run_coroutine_times_out():
+    with pytest.raises(TimeoutError):
+        run_coroutine(asyncio.sleep(1), timeout=0.05)
+
+
+def test_http_get_keeps_connection_alive():
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        peers: set = set()
+
+        def do_GET(self):
+            Handler.peers.add(self.client_address)
+            body = b"http://example.com/stream\n"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/station.m3u"
+    try:
+        assert http_get(url).text.strip() == "http://example.com/stream"
+        http_get(url)
+    finally:
+        netio.close()
+        server.shutdown()
+        server.server_close()
+
+    # Both requests went over the same pooled connection
+    assert len(Handler.peers) == 1
+
+
+def test_close_releases_shared_resources():
+    session = run_coroutine(aiohttp_session())
+    io_loop = get_io_loop()
+
+    netio.close()
+
+    assert session.closed
+    assert io_loop.loop.is_closed()
+    # A fresh loop is started on next use
+    assert get_io_loop() is not io_loop
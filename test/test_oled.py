@@ -0,0 +1,90 @@
+import threading
+
+from luma.oled.device import ssd1306
+from PIL import Image, ImageDraw
+
+from src.oled import COLUMNADDR, DisplayWorker, PageFlusher, dirty_ranges
+
+
+class RecordingSerial:
+    """luma serial interface that keeps the SSD1306 GDDRAM contents instead of using I2C"""
+
+    def __init__(self):
+        self.ram = [0] * 1024
+        self.addresses = []
+
+    def command(self, *cmd):
+        if cmd and cmd[0] == COLUMNADDR:
+            _, col_start, col_end, _, page_start, page_end = cmd
+            cols = range(col_start, col_end + 1)
+            # Horizontal addressing mode: columns first, then pages
+            self.addresses = [
+                page * 128 + col for page in range(page_start, page_end + 1) for col in cols
+            ]
+
+    def data(self, data):
+        for address, value in zip(self.addresses, data):
+            self.ram[address] = value
+
+    def cleanup(self):
+        pass
+
+
+def frame(text: str) -> Image.Image:
+    image = Image.new("1", (128, 64))
+    ImageDraw.Draw(image).text((0, 24), text, fill="white")
+    return image
+
+
+def test_partial_flush_matches_full_display():
+    full_serial = RecordingSerial()
+    full = ssd1306(full_serial)
+    partial_serial = RecordingSerial()
+    flusher = PageFlusher(ssd1306(partial_serial))
+
+    for text in ("Alarm: 06:45", "Alarm: 06:46"):
+        full.display(frame(text))
+        flusher.flush(frame(text))
+
+    assert partial_serial.ram == full_serial.ram
+    # Only the changed digit's columns on the text's pages were resent
+    assert 0 < flusher.last_flush["bytes"] < 2 * 128
+    assert flusher.last_flush["transactions"] in (2, 4)
+
+
+def test_dirty_ranges():
+    old = bytes(256)
+    new = bytearray(old)
+    new[130] = new[140] = 0xFF
+
+    assert dirty_ranges(old, bytes(new), 128) == [(1, 2, 12)]
+    assert dirty_ranges(None, bytes(new), 128) == [(0, 0, 127), (1, 0, 127)]
+
+
+def test_unchanged_frame_sends_nothing():
+    flusher = PageFlusher(ssd1306(RecordingSerial()))
+    flusher.flush(frame("7:30"))
+    flusher.flush(frame("7:30"))
+    assert flusher.last_flush == {"bytes": 0, "transactions": 0}
+
+
+def test_worker_drops_stale_frames():
+    flushed = []
+    release = threading.Event()
+
+    def slow_flush(image):
+        release.wait()
+        flushed.append(image)
+
+    worker = DisplayWorker(slow_flush)
+    worker.submit("first")
+    # Let the worker pick up the first frame and block on the bus
+    while not worker._busy:
+        pass
+    worker.submit("stale")
+    worker.submit("latest")
+    release.set()
+
+    assert worker.wait_idle(timeout=5)
+    assert flushed == ["first", "latest"]
+    assert worker.dropped == 1
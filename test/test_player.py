@@ -0,0 +1,171 @@
+from types import SimpleNamespace
+
+from src.player import PlayerEngine
+
+
+class FakeEventManager:
+    def __init__(self):
+        self.callbacks = {}
+
+    def event_attach(self, event_type, callback, *args):
+        self.callbacks[event_type] = (callback, args)
+
+    def send(self, event_type, **fields):
+        callback, args = self.callbacks[event_type]
+        callback(SimpleNamespace(u=SimpleNamespace(**fields)), *args)
+
+
+class FakePlayer:
+    def __init__(self, buffers: bool):
+        self.events = FakeEventManager()
+        self.buffers = buffers
+        self.media = None
+        self.playing = False
+        self.mute = False
+        self.volumes = []
+
+    def event_manager(self):
+        return self.events
+
+    def set_media(self, media):
+        self.media = media
+
+    def play(self):
+        self.playing = True
+        if self.buffers:
+            # Like a stream that buffers instantly (VLC sends this from its own thread)
+            self.events.send("buffering", new_cache=100.0)
+        return 0
+
+    def stop(self):
+        self.playing = False
+
+    def is_playing(self):
+        return self.playing
+
+    def audio_set_mute(self, mute):
+        self.mute = mute
+
+    def audio_set_volume(self, volume):
+        self.volumes.append(volume)
+
+    def release(self):
+        pass
+
+
+class FakeInstance:
+    def __init__(self, buffers: bool):
+        self.buffers = buffers
+        self.players = []
+
+    def media_player_new(self):
+        self.players.append(FakePlayer(self.buffers))
+        return self.players[-1]
+
+    def media_new(self, url):
+        return url
+
+    def release(self):
+        pass
+
+
+class FakeVlc:
+    """Stands in for the vlc module, counting created instances"""
+
+    EventType = SimpleNamespace(
+        MediaPlayerBuffering="buffering",
+        MediaPlayerTimeChanged="time",
+        MediaPlayerEndReached="end",
+        MediaPlayerEncounteredError="error",
+    )
+
+    def __init__(self, buffers: bool = False):
+        self.buffers = buffers
+        self.instances = []
+
+    def Instance(self, *args):
+        self.instances.append(FakeInstance(self.buffers))
+        return self.instances[-1]
+
+
+def test_instance_is_created_once():
+    vlc = FakeVlc()
+    engine = PlayerEngine(vlc_module=vlc)
+
+    engine.load("http://a")
+    engine.play()
+    engine.stop()
+    engine.load("http://b")
+    engine.play()
+
+    assert len(vlc.instances) == 1
+    assert len(vlc.instances[0].players) == 1
+    assert engine.player.media == "http://b"
+    assert {"instance_creation", "media_open"} <= engine.timings.keys()
+
+
+def test_prebuffer_and_timings():
+    vlc = FakeVlc()
+    engine = PlayerEngine(vlc_module=vlc)
+    engine.load("http://alarm")
+    engine.play(muted=True)
+
+    assert engine.muted and engine.player.mute
+    engine.player.events.send("buffering", new_cache=40.0)
+    assert "buffering" not in engine.timings
+    engine.player.events.send("buffering", new_cache=100.0)
+    engine.player.events.send("time", new_time=250)
+    assert {"buffering", "first_audio"} <= engine.timings.keys()
+
+    engine.set_muted(False)
+    assert not engine.player.mute
+
+
+def test_switch_buffers_on_standby_and_recycles_players():
+    vlc = FakeVlc(buffers=True)
+    engine = PlayerEngine(vlc_module=vlc)
+    engine.load("http://a")
+    engine.play()
+    first = engine.player
+
+    assert engine.switch("http://b", crossfade=0.1)
+    second = engine.player
+    assert second is not first and second.media == "http://b" and second.playing
+    # The old player was faded out and stopped, and is ready at full volume for the next switch
+    assert not first.playing
+    # Silent while buffering, then two crossfade steps
+    assert second.volumes == [0, 50, 100]
+    assert first.volumes == [50, 0, 100]
+    assert "switch" in engine.timings
+
+    assert engine.switch("http://c")
+    assert engine.player is first and first.media == "http://c"
+    assert len(vlc.instances[0].players) == 2
+
+
+def test_switch_keeps_playing_if_new_stream_does_not_buffer():
+    engine = PlayerEngine(vlc_module=FakeVlc(buffers=False))
+    engine.load("http://a")
+    engine.play()
+    active = engine.player
+
+    assert not engine.switch("http://dead", timeout=0.05)
+    assert engine.player is active and active.playing
+    assert engine.url == "http://a"
+
+
+def test_listeners_get_events_of_the_active_player_only():
+    vlc = FakeVlc(buffers=True)
+    engine = PlayerEngine(vlc_module=vlc)
+    events = []
+    engine.listeners.append(lambda *event: events.append(event))
+
+    engine.load("http://a")
+    engine.play()
+    assert engine.switch("http://b")
+    active, standby = vlc.instances[0].players[1], vlc.instances[0].players[0]
+    standby.events.send("end")
+    active.events.send("error")
+
+    # The standby's buffering during the switch isn't reported either
+    assert events == [("buffering", 100.0), ("error",)]
@@ -1,12 +1,16 @@
 from pathlib import Path
 
-from src.projector import Projector
+from src.projector import CLOCK_FRAMES, FRAME_BITS, Projector
+from src.transport import RecordingTransport, SpiTransport
 
 
 def test_clock_events():
     """
-    Test the clock event generation against known values from the CSV
+    Test the clock event generation and the precomputed frame table against known values
+    from the CSV
     """
+    assert len(CLOCK_FRAMES) == 24 * 60
+
     # Read the CSV file
     with (Path(__file__).parent / "all_time_events.csv").open() as f:
         lines = f.readlines()[1:]  # Skip header
@@ -40,6 +44,9 @@ def test_clock_events():
                 f"Expected: {expected}\n"
                 f"Got:      {bits_str}"
             )
+            assert (
+                format(CLOCK_FRAMES[hour * 60 + minute], "041b") == expected
+            ), f"Frame table mismatch for {hour:02d}:{minute:02d}"
 
 
 def test_the_time():
@@ -56,6 +63,51 @@ def test_the_time():
     )
 
 
-def test_create_projector():
-    projector = Projector()
+def test_create_projector(tmp_path):
+    transport = RecordingTransport()
+    projector = Projector(transport, cache_dir=tmp_path)
+    # Don't wait for the startup animation
+    projector.startup.cancel()
     projector.send_time(0, 0)
+    assert transport.frames[-1] == (CLOCK_FRAMES[0], FRAME_BITS)
+    projector.close()
+
+
+def test_recording_transport(tmp_path):
+    transport = RecordingTransport()
+    projector = Projector(transport, cache_dir=tmp_path)
+
+    # CSV replay drives the pins in the background and ends with all lines idle high
+    assert projector.startup.wait(timeout=5)
+    assert transport.pin_states[-1] == (True, True, True)
+
+    projector.send_time(11, 11)
+    projector.send_binary_event("1" * FRAME_BITS)
+    assert transport.frames == [
+        (CLOCK_FRAMES[11 * 60 + 11], FRAME_BITS),
+        ((1 << FRAME_BITS) - 1, FRAME_BITS),
+    ]
+    projector.close()
+
+
+def test_spi_frame_padding():
+    data = SpiTransport.frame_to_bytes(CLOCK_FRAMES[1], FRAME_BITS)
+    assert data == bytes([0xFF, 0x58, 0x68, 0xFD, 0xFD, 0x00])
+
+
+def test_send_time_skips_unchanged_frames(tmp_path):
+    transport = RecordingTransport()
+    projector = Projector(transport, cache_dir=tmp_path)
+
+    for _ in range(60):
+        projector.send_time(7, 30)
+    projector.send_time(7, 31)
+    projector.send_time(7, 31, force=True)
+
+    assert [frame for frame, _ in transport.frames] == [
+        CLOCK_FRAMES[7 * 60 + 30],
+        CLOCK_FRAMES[7 * 60 + 31],
+        CLOCK_FRAMES[7 * 60 + 31],
+    ]
+    assert projector.time_tracker.to_dict() == {"performed": 3, "skipped": 59}
+    projector.close()
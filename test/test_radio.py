@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta
+
+from src.alarms import Alarm
+from src.radio import Radio
+from src.store import StateStore
+
+
+def test_enabled_alarm_is_restored_and_scheduled(tmp_path):
+    store = StateStore(tmp_path / "state.log")
+    at = datetime.now() + timedelta(hours=12)
+    store.set("alarm/0", Alarm(at.strftime("%H:%M"), True).to_dict())
+    store.close()
+
+    radio = Radio(store=StateStore(tmp_path / "state.log"))
+    try:
+        assert radio.get_alarms()[0]["enabled"]
+        for job_id in ("alarm_trigger", "alarm_record", "alarm_prebuffer"):
+            assert radio.scheduler.get_job(job_id)
+    finally:
+        radio.cleanup()
+
+
+def test_stop_cancels_the_alarm_fallback(tmp_path):
+    radio = Radio(store=StateStore(tmp_path / "state.log"))
+    radio.commands.coalesce_window = 0
+    try:
+        radio.scheduler.add_job(
+            print, "date", run_date=datetime.now() + timedelta(hours=1), id="alarm_deadline"
+        )
+        radio.stop_radio().result(timeout=5)
+        assert radio.scheduler.get_job("alarm_deadline") is None
+    finally:
+        radio.cleanup()
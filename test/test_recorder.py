@@ -0,0 +1,74 @@
+from src.recorder import StreamRecorder
+
+
+def make_recorder(tmp_path, chunks, **kwargs):
+    return StreamRecorder(
+        lambda: None,
+        directory=tmp_path,
+        open_stream=lambda url: iter(chunks),
+        retry_delay=60,
+        **kwargs,
+    )
+
+
+def test_audio_is_written_in_large_appends_and_evicted(tmp_path):
+    recorder = make_recorder(
+        tmp_path, [b"x" * 100] * 50, max_bytes=2000, segment_bytes=1000, write_bytes=400
+    )
+    recorder.record("http://station")
+
+    # 5000 bytes in appends of 400 (plus the remainder when the stream ended)
+    assert recorder.bytes_written == 5000
+    assert recorder.writes == 13
+    segments = recorder.segments()
+    assert sum(segment.stat().st_size for segment in segments) <= 2000 + 400
+    # The newest audio is kept
+    assert segments[-1].name == "00000004.seg"
+
+
+def test_playlist_lists_segments_oldest_first(tmp_path):
+    recorder = make_recorder(tmp_path, [b"a" * 10, b"b" * 10], segment_bytes=10, write_bytes=10)
+    assert recorder.playlist() is None
+
+    recorder.record("http://station")
+    url = recorder.playlist()
+    assert url.startswith("file://")
+    lines = (tmp_path / "buffer.m3u").read_text().splitlines()
+    assert [line.rsplit("/", 1)[1] for line in lines] == ["00000000.seg", "00000001.seg"]
+
+
+def test_buffer_survives_restart(tmp_path):
+    make_recorder(tmp_path, [b"a" * 10], write_bytes=10).record("http://station")
+    recorder = make_recorder(tmp_path, [b"b" * 10], segment_bytes=10, write_bytes=10)
+    recorder.record("http://station")
+    assert [segment.read_bytes() for segment in recorder.segments()] == [b"a" * 10, b"b" * 10]
+
+
+def test_start_and_stop(tmp_path):
+    recorder = StreamRecorder(
+        lambda: "http://station",
+        directory=tmp_path,
+        open_stream=lambda url: iter([b"a" * 10] * 3),
+        write_bytes=1000,
+        retry_delay=60,
+    )
+    recorder.start()
+    recorder.stop()
+    # Whatever was received before stopping is on disk
+    assert recorder.bytes_written == sum(s.stat().st_size for s in recorder.segments())
+
+
+def test_stop_without_waiting_lets_the_thread_finish(tmp_path):
+    recorder = StreamRecorder(
+        lambda: "http://station",
+        directory=tmp_path,
+        open_stream=lambda url: iter([b"a" * 10] * 3),
+        write_bytes=1000,
+        retry_delay=60,
+    )
+    recorder.start()
+    recorder.stop(wait=False)
+    # Starting again waits for the old thread instead of leaving it running
+    recorder.start()
+    recorder.stop()
+    assert recorder.bytes_written == sum(s.stat().st_size for s in recorder.segments())
@@ -0,0 +1,62 @@
+from src.store import StateStore, encode_record
+
+
+def test_changes_survive_a_restart(tmp_path):
+    path = tmp_path / "state.log"
+    store = StateStore(path, flush_delay=0)
+    assert store.load() == {}
+    store.set("station", "fm4")
+    store.set("alarm/0", {"time": "07:00", "enabled": True})
+    store.set("alarm/1", {"time": "08:00", "enabled": False})
+    store.delete("alarm/1")
+    assert store.get("station") == "fm4"
+    assert store.get("alarm/1") is None
+    store.close()
+
+    restored = StateStore(path).load()
+    assert restored == {"station": "fm4", "alarm/0": {"time": "07:00", "enabled": True}}
+
+
+def test_bursts_are_coalesced_into_one_write(tmp_path):
+    store = StateStore(tmp_path / "state.log", flush_delay=60)
+    store.load()
+    for minute in range(50):
+        store.set("alarm/0", {"time": f"07:{minute:02d}", "enabled": True})
+    store.flush()
+
+    assert store.stats["changes"] == 50
+    assert store.stats["records"] == 1
+    assert store.stats["fsyncs"] == 1
+    # Writing the same value again costs nothing
+    store.set("alarm/0", {"time": "07:49", "enabled": True})
+    store.flush()
+    assert store.stats["fsyncs"] == 1
+    store.close()
+
+
+def test_log_is_compacted(tmp_path):
+    path = tmp_path / "state.log"
+    store = StateStore(path, flush_delay=60, compact_ratio=2, min_compact_records=4)
+    store.load()
+    for minute in range(10):
+        store.set("alarm/0", {"time": f"07:{minute:02d}", "enabled": True})
+        store.flush()
+    store.close()
+
+    assert store.stats["compactions"] > 0
+    assert len(path.read_bytes().splitlines()) <= 4
+    assert StateStore(path).load() == {"alarm/0": {"time": "07:09", "enabled": True}}
+
+
+def test_torn_and_corrupt_records_are_discarded(tmp_path):
+    path = tmp_path / "state.log"
+    good = encode_record("station", "br")
+    corrupt = encode_record("station", "fm4").replace(b"fm4", b"fm5")
+    path.write_bytes(good + corrupt + encode_record("alarm/0", {"time": "06:00"})[:10])
+
+    store = StateStore(path)
+    assert store.load() == {"station": "br"}
+    assert store.stats["discarded_bytes"] > 0
+    # The log was rewritten, so new records are not appended after garbage
+    assert path.read_bytes() == good
+    store.close()
@@ -0,0 +1,84 @@
+from src.streams import StreamResolver, is_playlist, parse_playlist
+
+M3U = """#EXTM3U
+#EXTINF:-1,SRF 2
+https://stream.example.com/a.aac
+
+https://stream.example.com/b.aac
+"""
+
+PLS = """[playlist]
+NumberOfEntries=2
+File1=http://stream.example.com/one.mp3
+Title1=One
+File2=http://stream.example.com/two.mp3
+Version=2
+"""
+
+
+def test_parse_playlists():
+    assert parse_playlist(M3U) == [
+        "https://stream.example.com/a.aac",
+        "https://stream.example.com/b.aac",
+    ]
+    assert parse_playlist(PLS) == [
+        "http://stream.example.com/one.mp3",
+        "http://stream.example.com/two.mp3",
+    ]
+    assert is_playlist("https://stream.srg-ssr.ch/drs2/aacp_96.m3u?token=1")
+    assert not is_playlist("https://orf-live.ors-shoutcast.at/fm4-q2a")
+
+
+class FakeFetch:
+    def __init__(self, text):
+        self.text = text
+        self.calls = 0
+
+    def __call__(self, url):
+        self.calls += 1
+        if isinstance(self.text, Exception):
+            raise self.text
+        return self.text
+
+
+def test_caches_until_ttl():
+    fetch = FakeFetch(M3U)
+    now = [0.0]
+    resolver = StreamResolver(fetch, ttl=100, clock=lambda: now[0])
+
+    assert resolver.get_stream_url("http://x/list.m3u") == "https://stream.example.com/a.aac"
+    resolver.get_stream_url("http://x/list.m3u")
+    assert fetch.calls == 1
+
+    now[0] = 150.0
+    resolver.get_stream_url("http://x/list.m3u")
+    assert fetch.calls == 2
+
+    # Direct stream URLs are never fetched
+    assert resolver.get_stream_url("http://x/live") == "http://x/live"
+    assert fetch.calls == 2
+
+
+def test_serves_stale_playlist_when_fetch_fails():
+    fetch = FakeFetch(PLS)
+    now = [0.0]
+    resolver = StreamResolver(fetch, ttl=100, clock=lambda: now[0])
+    resolver.get_stream_url("http://x/list.pls")
+
+    now[0] = 150.0
+    fetch.text = OSError("offline")
+    assert resolver.get_stream_url("http://x/list.pls") == "http://stream.example.com/one.mp3"
+
+
+def test_failover_to_next_entry():
+    fetch = FakeFetch(M3U)
+    resolver = StreamResolver(fetch)
+
+    first = resolver.get_stream_url("http://x/list.m3u")
+    second = resolver.failover("http://x/list.m3u", first)
+    assert second == "https://stream.example.com/b.aac"
+
+    # Once every entry failed the playlist is fetched again on the next play
+    assert resolver.failover("http://x/list.m3u", second) is None
+    assert resolver.get_stream_url("http://x/list.m3u") == first
+    assert fetch.calls == 2
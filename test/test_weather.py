@@ -0,0 +1,98 @@
+import json
+
+from src.weather import Weather, WeatherService
+
+
+class FakeProvider:
+    """Returns queued results (Weather or Exception) instead of hitting the network"""
+
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = 0
+
+    def __call__(self) -> Weather:
+        self.calls += 1
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def test_serves_cache_from_disk(tmp_path):
+    cache_path = tmp_path / "weather.json"
+    cache_path.write_text(
+        json.dumps({"min_temperature": 3.0, "max_temperature": 9.0, "fetched_at": 1000.0})
+    )
+    updates = []
+    service = WeatherService(
+        updates.append, FakeProvider(), cache_path=cache_path, ttl=600, clock=lambda: 1100.0
+    )
+    service._load_cache()
+
+    assert service.weather == Weather(3.0, 9.0)
+    assert not service.is_stale()
+    assert service._step() == 500.0
+
+
+def test_refreshes_stale_cache_and_persists(tmp_path):
+    cache_path = tmp_path / "weather.json"
+    updates = []
+    provider = FakeProvider(Weather(1.0, 5.0))
+    now = [0.0]
+    service = WeatherService(
+        updates.append, provider, cache_path=cache_path, ttl=600, clock=lambda: now[0]
+    )
+
+    assert service.is_stale()
+    assert service._step() == 600
+    assert updates == [Weather(1.0, 5.0)]
+    assert json.loads(cache_path.read_text())["max_temperature"] == 5.0
+
+    now[0] = 700.0
+    provider.results.append(Weather(2.0, 6.0))
+    service._step()
+    assert updates[-1] == Weather(2.0, 6.0)
+
+
+def test_backs_off_on_failure(tmp_path):
+    updates = []
+    provider = FakeProvider(OSError("down"), OSError("down"), OSError("down"), Weather(1.0, 2.0))
+    service = WeatherService(
+        updates.append,
+        provider,
+        cache_path=tmp_path / "weather.json",
+        min_backoff=30,
+        max_backoff=100,
+    )
+
+    assert [service._step() for _ in range(3)] == [30, 60, 100]
+    assert updates == []
+
+    service._step()
+    assert service.failures == 0
+    assert updates == [Weather(1.0, 2.0)]
+
+
+def test_cache_from_the_future_is_stale(tmp_path):
+    provider = FakeProvider(Weather(1.0, 2.0))
+    service = WeatherService(
+        lambda weather: None, provider, cache_path=tmp_path / "weather.json", ttl=1800
+    )
+    service.weather = Weather(3.0, 9.0)
+    # Clock one hour behind the time the cache was written
+    service.fetched_at = service.clock() + 3600
+
+    assert service.is_stale()
+    assert service._step() == 1800
+    assert provider.calls == 1
+
+
+def test_failing_update_callback_does_not_stop_refreshes(tmp_path):
+    def on_update(weather):
+        raise OSError("I2C bus error")
+
+    provider = FakeProvider(Weather(1.0, 2.0))
+    service = WeatherService(on_update, provider, cache_path=tmp_path / "weather.json")
+
+    assert service._step() == service.ttl
+    assert service.weather == Weather(1.0, 2.0)